@@ -0,0 +1,25 @@
+# Generated by Django 4.2.1 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("comments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["post", "created_time", "id"],
+                name="commentary_post_time_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="commentary",
+            index=models.Index(
+                fields=["created_time", "id"], name="commentary_time_idx"
+            ),
+        ),
+    ]
@@ -19,3 +19,14 @@ class Commentary(models.Model):
     class Meta:
         ordering = ["created_time"]
         verbose_name_plural = "Commentaries"
+        indexes = [
+            models.Index(
+                fields=["post", "created_time", "id"],
+                name="commentary_post_time_idx",
+            ),
+            # The comment list pages through every post's comments
+            models.Index(
+                fields=["created_time", "id"],
+                name="commentary_time_idx",
+            ),
+        ]
@@ -1,15 +1,23 @@
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
 
 from comments.models import Commentary
+from posts.counters import adjust_counters
 
 
 class CommentarySerializer(serializers.ModelSerializer):
+    username = serializers.CharField(
+        source="user.profile.username", read_only=True, allow_null=True
+    )
+
     class Meta:
         model = Commentary
         fields = [
             "id",
             "created_time",
             "user",
+            "username",
             "content",
         ]
 
@@ -25,10 +33,13 @@ class CommentaryCreateSerializer(serializers.ModelSerializer):
         post_pk = self.context.get("post_pk")
         user = self.context.get("user")
         content = validated_data.get("content")
-        comment = Commentary.objects.create(
-            user=user,
-            post_id=post_pk,
-            content=content
-        )
-        comment.save()
+        with transaction.atomic():
+            # A missing post updates no row; check before the insert fails
+            if not adjust_counters(post_pk, comments_count=1):
+                raise NotFound("Post not found")
+            comment = Commentary.objects.create(
+                user=user,
+                post_id=post_pk,
+                content=content
+            )
         return comment
@@ -6,12 +6,14 @@ from comments.serializers import (
     CommentaryCreateSerializer,
     CommentarySerializer
 )
+from social_media_api.pagination import CommentaryPagination
 
 
 class CommentaryListViewSet(mixins.ListModelMixin, GenericViewSet):
     serializer_class = CommentarySerializer
-    queryset = Commentary.objects.all()
+    queryset = Commentary.objects.select_related("user__profile")
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CommentaryPagination
 
 
 class CommentaryCreateViewSet(mixins.CreateModelMixin, GenericViewSet):
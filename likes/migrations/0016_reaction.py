@@ -0,0 +1,130 @@
+# Generated by Django 4.2.1 on 2026-10-18 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+LIKE, DISLIKE = 1, -1
+
+
+def copy_to_reactions(apps, schema_editor):
+    """
+    Move likes and dislikes into reactions, keeping the first row of any
+    duplicate (post, user) pair, then recount the post counters.
+    """
+    Reaction = apps.get_model("likes", "Reaction")
+    Post = apps.get_model("posts", "Post")
+    sources = (
+        (apps.get_model("likes", "Like"), LIKE),
+        (apps.get_model("likes", "Dislike"), DISLIKE),
+    )
+    for model, value in sources:
+        rows = model.objects.order_by("id").values_list("post_id", "user_id")
+        batch = []
+        for post_id, user_id in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(
+                Reaction(post_id=post_id, user_id=user_id, value=value)
+            )
+            if len(batch) >= BATCH_SIZE:
+                Reaction.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        Reaction.objects.bulk_create(batch, ignore_conflicts=True)
+
+    Post.objects.update(likes_count=0, dislikes_count=0)
+    for field, value in (("likes_count", LIKE), ("dislikes_count", DISLIKE)):
+        totals = (
+            Reaction.objects.filter(value=value)
+            .order_by()
+            .values_list("post_id")
+            .annotate(total=Count("pk"))
+            .values_list("post_id", "total")
+        )
+        for post_id, total in totals:
+            Post.objects.filter(pk=post_id).update(**{field: total})
+
+
+def copy_from_reactions(apps, schema_editor):
+    Reaction = apps.get_model("likes", "Reaction")
+    targets = {
+        LIKE: apps.get_model("likes", "Like"),
+        DISLIKE: apps.get_model("likes", "Dislike"),
+    }
+    for value, model in targets.items():
+        rows = Reaction.objects.filter(value=value).values_list(
+            "post_id", "user_id"
+        )
+        model.objects.bulk_create(
+            (
+                model(post_id=post_id, user_id=user_id)
+                for post_id, user_id in rows.iterator(chunk_size=BATCH_SIZE)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("posts", "0015_scheduledpost"),
+        ("likes", "0015_dislike"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Reaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "value",
+                    models.SmallIntegerField(
+                        choices=[(1, "Like"), (-1, "Dislike")]
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reactions",
+                        to="posts.post",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reactions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reaction",
+            index=models.Index(
+                fields=["post", "value", "id"], name="reaction_post_value_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="reaction",
+            constraint=models.UniqueConstraint(
+                fields=("post", "user"), name="unique_post_reaction"
+            ),
+        ),
+        migrations.RunPython(copy_to_reactions, copy_from_reactions),
+        migrations.DeleteModel(
+            name="Dislike",
+        ),
+        migrations.DeleteModel(
+            name="Like",
+        ),
+    ]
@@ -4,25 +4,33 @@ from posts.models import Post
 from social_media_api import settings
 
 
-class Like(models.Model):
-    user = models.ForeignKey(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
-    )
-    post = models.ForeignKey(
-        Post,
-        related_name="likes",
-        on_delete=models.CASCADE,
-    )
+class Reaction(models.Model):
+    """A user's like or dislike of a post, at most one per post."""
 
+    class Value(models.IntegerChoices):
+        LIKE = 1, "Like"
+        DISLIKE = -1, "Dislike"
 
-class Dislike(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        related_name="reactions",
     )
     post = models.ForeignKey(
         Post,
-        related_name="dislikes",
+        related_name="reactions",
         on_delete=models.CASCADE,
     )
+    value = models.SmallIntegerField(choices=Value.choices)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "user"], name="unique_post_reaction"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["post", "value", "id"], name="reaction_post_value_idx"
+            ),
+        ]
@@ -0,0 +1,90 @@
+"""
+Atomic like, dislike and clear on the unified ``Reaction`` table.
+
+Every toggle is one conditional write on the reaction row followed by
+one ``F()`` update of the post counters, in a single transaction; the
+unique (post, user) constraint, not a prior read, keeps concurrent
+clicks from creating duplicate reactions. In the buffered counter write
+mode the counter deltas go to the write-behind buffer once the
+transaction commits instead.
+"""
+from django.db import connection, transaction
+from rest_framework.exceptions import NotFound
+
+from likes.models import Reaction
+from posts import counter_buffer
+from posts.counters import adjust_counters
+from posts.models import Post
+
+COUNTER_FIELDS = {
+    Reaction.Value.LIKE: "likes_count",
+    Reaction.Value.DISLIKE: "dislikes_count",
+}
+
+
+def _insert(post_id: int, user_id: int, value: int) -> bool:
+    """Insert the reaction unless the user already reacted to the post"""
+    table = Reaction._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (post_id, user_id, value) "
+            "VALUES (%s, %s, %s) ON CONFLICT (post_id, user_id) DO NOTHING",
+            [post_id, user_id, value],
+        )
+        return cursor.rowcount == 1
+
+
+def _check_post(post_id: int) -> None:
+    """Buffered counters cannot detect a missing post, so look it up"""
+    if (
+        counter_buffer.is_enabled()
+        and not Post.objects.filter(pk=post_id).exists()
+    ):
+        raise NotFound("Post not found")
+
+
+def _adjust(post_id: int, **deltas: int) -> None:
+    if counter_buffer.is_enabled():
+        transaction.on_commit(lambda: counter_buffer.add(post_id, **deltas))
+    elif deltas and not adjust_counters(post_id, **deltas):
+        raise NotFound("Post not found")
+
+
+def react(post_id: int, user_id: int, value: int) -> bool:
+    """
+    Set the user's reaction to ``value``, return False if it already was.
+    Raise NotFound for a missing post.
+    """
+    value = Reaction.Value(value)
+    opposite = Reaction.Value(-value)
+    _check_post(post_id)
+    with transaction.atomic():
+        if _insert(post_id, user_id, value):
+            _adjust(post_id, **{COUNTER_FIELDS[value]: 1})
+            return True
+        flipped = Reaction.objects.filter(
+            post_id=post_id, user_id=user_id, value=opposite
+        ).update(value=value)
+        if flipped:
+            _adjust(
+                post_id,
+                **{COUNTER_FIELDS[value]: 1, COUNTER_FIELDS[opposite]: -1},
+            )
+        return bool(flipped)
+
+
+def clear(post_id: int, user_id: int) -> bool:
+    """Remove the user's reaction, return False if there was none"""
+    table = Reaction._meta.db_table
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {table} WHERE post_id = %s AND user_id = %s "
+                "RETURNING value",
+                [post_id, user_id],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return False
+        _adjust(post_id, **{COUNTER_FIELDS[row[0]]: -1})
+        return True
@@ -1,61 +1,14 @@
 from rest_framework import serializers
-from likes.models import Like
+from likes.models import Reaction
 from users.serializers import UserUsernameSerializer
 
 
-class LikeSerializer(serializers.ModelSerializer):
+class ReactionSerializer(serializers.ModelSerializer):
     user = UserUsernameSerializer(read_only=True)
 
     class Meta:
-        model = Like
+        model = Reaction
         fields = [
             "id",
             "user",
         ]
-
-
-class LikeCreateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Like
-        fields = [
-            "user",
-            "post",
-        ]
-
-
-class LikeDeleteSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Like
-        fields = [
-            "user",
-            "post",
-        ]
-
-
-class DislikeSerializer(serializers.ModelSerializer):
-    user = UserUsernameSerializer(read_only=True)
-
-    class Meta:
-        model = Like
-        fields = [
-            "id",
-            "user",
-        ]
-
-
-class DislikeCreateSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Like
-        fields = [
-            "user",
-            "post",
-        ]
-
-
-class DislikeDeleteSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Like
-        fields = [
-            "user",
-            "post",
-        ]
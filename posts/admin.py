@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from posts.models import Post
+from posts.models import Post, ScheduledPost
 
 admin.site.register(Post)
+admin.site.register(ScheduledPost)
@@ -0,0 +1,133 @@
+"""
+Coalescing buffer for posts created by the worker.
+
+In the "batch" POST_CREATE_MODE the create endpoint appends posts to a
+Redis list instead of sending one ``create_post`` message each, and a
+single drainer turns the list into posts a batch at a time: one ``IN``
+query resolves every owner and one transaction inserts the batch.
+
+A batch is moved from the list to a processing key under a random id in
+one MULTI, and the id is recorded as an ``AppliedBatch`` in the insert
+transaction: a drainer that crashed before the insert leaves the batch
+for the next one, and one that crashed after it cannot insert it twice.
+"""
+import json
+import uuid
+from typing import Iterable, Optional, TypedDict
+
+import redis
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.bulk import insert_posts
+from posts.models import AppliedBatch, Post
+from social_media_api.broker import get_redis
+
+BUFFER_KEY = "posts:create-buffer"
+PROCESSING_KEY = "posts:create-buffer:processing"
+LOCK_KEY = "posts:create-buffer:lock"
+LOCK_TIMEOUT = 300
+
+
+class BufferedPost(TypedDict):
+    owner_id: int
+    title: str
+    content: str
+    created_time: str
+
+
+def get_create_mode() -> str:
+    return getattr(settings, "POST_CREATE_MODE", "single")
+
+
+def get_batch_size() -> int:
+    return getattr(settings, "POST_CREATE_BATCH_SIZE", 1000)
+
+
+def push(owner_id: int, title: str, content: str) -> int:
+    """Append a post to the buffer and return the buffer length"""
+    item = BufferedPost(
+        owner_id=owner_id,
+        title=title,
+        content=content,
+        created_time=timezone.now().isoformat(),
+    )
+    return get_redis().rpush(BUFFER_KEY, json.dumps(item))
+
+
+def create_buffered_posts(items: Iterable[BufferedPost]) -> list[Post]:
+    """Insert a batch of buffered posts whose owners still exist"""
+    items = list(items)
+    owner_ids = set(
+        get_user_model()
+        .objects.filter(id__in={item["owner_id"] for item in items})
+        .values_list("id", flat=True)
+    )
+    return insert_posts([
+        Post(
+            owner_id=item["owner_id"],
+            title=item["title"],
+            content=item["content"],
+            created_time=parse_datetime(item["created_time"]),
+        )
+        for item in items
+        if item["owner_id"] in owner_ids
+    ])
+
+
+def take_batch(client: redis.Redis, size: int) -> Optional[dict]:
+    """
+    The batch left by a crashed drainer, or the next ``size`` buffered
+    posts moved to the processing key
+    """
+    leftover = client.get(PROCESSING_KEY)
+    if leftover is not None:
+        return json.loads(leftover)
+    raw = client.lrange(BUFFER_KEY, 0, size - 1)
+    if not raw:
+        return None
+    batch = {
+        "id": uuid.uuid4().hex,
+        "items": [json.loads(item) for item in raw],
+    }
+    pipeline = client.pipeline(transaction=True)
+    pipeline.set(PROCESSING_KEY, json.dumps(batch))
+    pipeline.ltrim(BUFFER_KEY, len(raw), -1)
+    pipeline.execute()
+    return batch
+
+
+def drain(max_batches: int = 100) -> int:
+    """
+    Turn buffered posts into posts until the buffer is empty; return
+    how many were read. Only one drainer runs at a time.
+    """
+    client = get_redis()
+    batch_size = get_batch_size()
+    drained = 0
+    lock = client.lock(LOCK_KEY, timeout=LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        for _ in range(max_batches):
+            batch = take_batch(client, batch_size)
+            if batch is None:
+                break
+            with transaction.atomic():
+                if AppliedBatch.record(f"post-buffer:{batch['id']}"):
+                    create_buffered_posts(batch["items"])
+            client.delete(PROCESSING_KEY)
+            drained += len(batch["items"])
+            lock.extend(LOCK_TIMEOUT, replace_ttl=True)
+        AppliedBatch.prune()
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            # Expired and maybe taken by another drainer
+            pass
+    return drained
@@ -0,0 +1,67 @@
+"""
+Batched post creation for importers.
+
+``bulk_create`` skips model signals, so the work normally done by the
+post_save receivers (timeline fan-out, generation bump) is done here once
+per batch instead of once per post.
+"""
+from datetime import datetime
+from typing import Iterable, Optional, TypedDict
+
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import Post
+from social_media_api.generations import bump_generation
+
+BATCH_SIZE = 500
+MAX_POSTS = 5000
+
+
+class PostItem(TypedDict):
+    title: str
+    content: str
+    created_time: Optional[datetime]
+
+
+def insert_posts(posts: list[Post]) -> list[Post]:
+    """Insert posts in batches and fan them out to followers' timelines"""
+    # posts.tasks imports this module through posts.buffer
+    from posts.tasks import queue_fan_out
+
+    if not posts:
+        return []
+    with transaction.atomic():
+        posts = Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
+        post_ids = [post.id for post in posts]
+        transaction.on_commit(lambda: queue_fan_out(post_ids))
+    bump_generation("posts")
+    return posts
+
+
+def create_posts(owner_id: int, items: Iterable[PostItem]) -> list[Post]:
+    now = timezone.now()
+    return insert_posts([
+        Post(
+            owner_id=owner_id,
+            title=item["title"],
+            content=item["content"],
+            created_time=item.get("created_time") or now,
+        )
+        for item in items
+    ])
+
+
+def split_scheduled(
+    items: Iterable[PostItem],
+) -> tuple[list[PostItem], list[PostItem]]:
+    """Split items into those due now and those with a future created_time"""
+    now = timezone.now()
+    due, scheduled = [], []
+    for item in items:
+        created_time = item.get("created_time")
+        if created_time and created_time > now:
+            scheduled.append(item)
+        else:
+            due.append(item)
+    return due, scheduled
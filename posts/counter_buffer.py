@@ -0,0 +1,231 @@
+"""
+Write-behind buffer for post reaction counters.
+
+With COUNTER_WRITE_MODE = "buffered" like and dislike deltas are summed
+in a Redis hash instead of updating the hot post row on every click, and
+the ``flush_post_counters`` beat task applies everything accumulated
+since the last tick with one ``UPDATE ... CASE`` statement. When Redis is
+down the deltas are summed in process memory and that process flushes
+them itself every COUNTER_FLUSH_INTERVAL seconds.
+
+Readers add the pending deltas to the persisted counters with
+``apply_pending``, so a user sees their own reaction counted at once.
+
+A flush renames the pending hash and tags it with a flush id in one
+MULTI, and records the id as an ``AppliedBatch`` in the transaction of
+the UPDATE: a flush that dies after the commit leaves a hash the next
+flush only deletes. Readers never look at the hash being flushed.
+"""
+import threading
+import uuid
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+import redis
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from posts.models import AppliedBatch, Post
+from social_media_api.broker import (
+    get_redis,
+    is_broker_available,
+    record_failure,
+)
+from social_media_api.generations import bump_generation
+
+PENDING_KEY = "post-counters:pending"
+FLUSHING_KEY = "post-counters:flushing"
+LOCK_KEY = "post-counters:lock"
+FLUSH_ID_FIELD = "flush-id"
+FIELDS = ("likes_count", "dislikes_count")
+
+Deltas = dict[int, dict[str, int]]
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "COUNTER_WRITE_MODE", "direct") == "buffered"
+
+
+def get_flush_interval() -> float:
+    return getattr(settings, "COUNTER_FLUSH_INTERVAL", 5.0)
+
+
+def apply_deltas(deltas: Deltas) -> int:
+    """Add ``deltas`` to their posts with one UPDATE, return posts updated"""
+    deltas = {
+        post_id: changes
+        for post_id, changes in deltas.items()
+        if any(changes.values())
+    }
+    if not deltas:
+        return 0
+    updates = {}
+    for field in FIELDS:
+        whens = [
+            When(pk=post_id, then=Value(changes[field]))
+            for post_id, changes in deltas.items()
+            if changes.get(field)
+        ]
+        if whens:
+            updates[field] = F(field) + Case(
+                *whens, default=Value(0), output_field=IntegerField()
+            )
+    updated = Post.objects.filter(pk__in=deltas).update(
+        updated_at=timezone.now(), **updates
+    )
+    bump_generation("posts")
+    return updated
+
+
+class LocalBuffer:
+    """
+    In-process deltas used while Redis is unreachable; a timer flushes
+    them COUNTER_FLUSH_INTERVAL seconds after the first one arrives.
+    """
+
+    def __init__(self) -> None:
+        self.deltas: Deltas = defaultdict(Counter)
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+
+    def add(self, post_id: int, deltas: dict[str, int]) -> None:
+        with self.lock:
+            for field, delta in deltas.items():
+                self.deltas[post_id][field] += delta
+            if self.timer is None:
+                self.timer = threading.Timer(
+                    get_flush_interval(), self.flush_in_thread
+                )
+                self.timer.daemon = True
+                self.timer.start()
+
+    def pending(self, post_ids: Iterable[int]) -> Deltas:
+        with self.lock:
+            return {
+                post_id: dict(self.deltas[post_id])
+                for post_id in post_ids
+                if post_id in self.deltas
+            }
+
+    def flush(self) -> int:
+        with self.lock:
+            deltas, self.deltas = self.deltas, defaultdict(Counter)
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        return apply_deltas(deltas)
+
+    def flush_in_thread(self) -> None:
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+
+local_buffer = LocalBuffer()
+
+
+def _field_key(post_id: int, field: str) -> str:
+    return f"{post_id}:{field}"
+
+
+def _parse(raw: dict) -> Deltas:
+    deltas = defaultdict(dict)
+    for key, value in raw.items():
+        post_id, field = key.decode().split(":")
+        deltas[int(post_id)][field] = int(value)
+    return deltas
+
+
+def add(post_id: int, **deltas: int) -> None:
+    """Buffer counter ``deltas`` (e.g. likes_count=1) of a post"""
+    post_id = int(post_id)
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    if is_broker_available():
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for field, delta in deltas.items():
+                pipe.hincrby(PENDING_KEY, _field_key(post_id, field), delta)
+            pipe.execute()
+        except redis.exceptions.RedisError:
+            record_failure()
+            local_buffer.add(post_id, deltas)
+    else:
+        local_buffer.add(post_id, deltas)
+    bump_generation("posts")
+
+
+def pending_deltas(post_ids: Iterable[int]) -> Deltas:
+    """Deltas of ``post_ids`` that are not in the database yet"""
+    post_ids = list(post_ids)
+    pending = defaultdict(Counter)
+    for post_id, changes in local_buffer.pending(post_ids).items():
+        for field, delta in changes.items():
+            pending[post_id][field] += delta
+    if post_ids and is_broker_available():
+        keys = [(post_id, field) for post_id in post_ids for field in FIELDS]
+        try:
+            values = get_redis().hmget(
+                PENDING_KEY, [_field_key(*item) for item in keys]
+            )
+            for (post_id, field), value in zip(keys, values, strict=True):
+                if value:
+                    pending[post_id][field] += int(value)
+        except redis.exceptions.RedisError:
+            record_failure()
+    return pending
+
+
+def apply_pending(posts: Iterable[Post]) -> None:
+    """Add pending deltas to the counters of loaded posts, once"""
+    posts = [
+        post for post in posts if not getattr(post, "pending_applied", False)
+    ]
+    if not posts or not is_enabled():
+        return
+    pending = pending_deltas(post.id for post in posts)
+    for post in posts:
+        for field, delta in pending.get(post.id, {}).items():
+            setattr(post, field, getattr(post, field) + delta)
+        post.pending_applied = True
+
+
+def flush() -> int:
+    """Write every buffered delta to the database, return posts updated"""
+    updated = local_buffer.flush()
+    if not is_broker_available():
+        return updated
+    client = get_redis()
+    lock = client.lock(LOCK_KEY, timeout=60)
+    if not lock.acquire(blocking=False):
+        return updated
+    try:
+        # A leftover flushing hash belongs to a flush that died before
+        # deleting it; finish it before taking the next one.
+        if not client.exists(FLUSHING_KEY):
+            if not client.exists(PENDING_KEY):
+                return updated
+            pipe = client.pipeline(transaction=True)
+            pipe.rename(PENDING_KEY, FLUSHING_KEY)
+            pipe.hset(FLUSHING_KEY, FLUSH_ID_FIELD, uuid.uuid4().hex)
+            pipe.execute()
+        raw = client.hgetall(FLUSHING_KEY)
+        flush_id = raw.pop(FLUSH_ID_FIELD.encode(), b"").decode()
+        with transaction.atomic():
+            if not flush_id or AppliedBatch.record(
+                f"post-counters:{flush_id}"
+            ):
+                updated += apply_deltas(_parse(raw))
+        client.delete(FLUSHING_KEY)
+        AppliedBatch.prune()
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            # Expired and maybe taken by another flush
+            pass
+    return updated
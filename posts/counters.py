@@ -0,0 +1,86 @@
+"""
+Denormalized reaction and comment counters stored on ``Post``.
+
+Writers adjust them with atomic ``F()`` updates next to the row they
+create or delete; ``rebuild_post_counters`` recomputes them from the
+source tables when they drift.
+"""
+from typing import Optional
+
+from django.apps import apps as global_apps
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from posts.models import Post
+from social_media_api.generations import bump_generation
+
+COUNTER_SOURCES = {
+    "likes_count": ("likes.Reaction", "post_id", Q(value=1)),
+    "dislikes_count": ("likes.Reaction", "post_id", Q(value=-1)),
+    "comments_count": ("comments.Commentary", "post_id", Q()),
+}
+BATCH_SIZE = 1000
+
+
+def adjust_counters(post_id: int, **deltas: int) -> int:
+    """
+    Atomically add ``deltas`` (e.g. likes_count=1) to a post, return
+    the number of updated posts
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    updated = Post.objects.filter(pk=post_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()},
+    )
+    bump_generation("posts")
+    return updated
+
+
+def count_by_post(
+    model, post_field: str, condition: Optional[Q] = None
+) -> dict[int, int]:
+    return dict(
+        model.objects.filter(condition or Q())
+        .order_by()
+        .values_list(post_field)
+        .annotate(total=Count("pk"))
+        .values_list(post_field, "total")
+    )
+
+
+def rebuild_post_counters(apps=global_apps) -> int:
+    """
+    Recompute every counter with one GROUP BY per source table and write
+    back only the posts whose stored values are wrong.
+    Return the number of fixed posts. ``apps`` lets migrations pass their
+    historical app registry.
+    """
+    post_model = apps.get_model("posts", "Post")
+    totals = {
+        field: count_by_post(apps.get_model(model), post_field, condition)
+        for field, (model, post_field, condition) in COUNTER_SOURCES.items()
+    }
+    fields = list(COUNTER_SOURCES)
+    stale = []
+    fixed = 0
+    for post in post_model.objects.only("id", *fields).iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        changed = False
+        for field in fields:
+            expected = totals[field].get(post.id, 0)
+            if getattr(post, field) != expected:
+                setattr(post, field, expected)
+                changed = True
+        if changed:
+            stale.append(post)
+        if len(stale) >= BATCH_SIZE:
+            post_model.objects.bulk_update(stale, fields)
+            fixed += len(stale)
+            stale = []
+    if stale:
+        post_model.objects.bulk_update(stale, fields)
+        fixed += len(stale)
+    return fixed
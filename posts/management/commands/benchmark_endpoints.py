@@ -0,0 +1,120 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from social_media_api import benchmarks, broker
+from social_media_api.celery import app
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed throwaway databases of several sizes, drive every endpoint "
+        "in-process and compare query counts, p50/p95 latency and peak "
+        "allocations with the checked-in baseline. Celery runs eagerly, "
+        "so no broker is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--datasets",
+            nargs="+",
+            choices=list(benchmarks.DATASETS),
+            default=list(benchmarks.DATASETS),
+        )
+        parser.add_argument(
+            "--scenarios", nargs="+", choices=list(benchmarks.SCENARIOS)
+        )
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument(
+            "--warmup", type=int, default=benchmarks.WARMUP
+        )
+        parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=1.0,
+            help="Allowed p95 latency growth over the baseline (1.0 = 2x)",
+        )
+        parser.add_argument(
+            "--memory-tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed peak allocation growth over the baseline",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Write the results as the new baseline instead of comparing",
+        )
+
+    def handle(self, *args, **options):
+        baseline = benchmarks.load_baseline(options["baseline"])
+        results = {}
+        setup_test_environment(debug=False)
+        app.conf.task_always_eager = True
+        app.conf.task_eager_propagates = True
+        monitor = broker.monitor
+        broker.monitor = broker.BrokerHealthMonitor(ping=lambda: True)
+        broker.monitor.check()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            for name in options["datasets"]:
+                call_command("flush", interactive=False, verbosity=0)
+                results[name] = self.run_dataset(name, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            broker.monitor = monitor
+            teardown_test_environment()
+
+        if options["update_baseline"]:
+            benchmarks.save_baseline(options["baseline"], results)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Baseline written to {options['baseline']}"
+                )
+            )
+            return
+
+        failures = [
+            f"{name}/{failure}"
+            for name, scenarios in results.items()
+            for failure in benchmarks.regressions(
+                scenarios,
+                baseline.get(name, {}),
+                options["tolerance"],
+                options["memory_tolerance"],
+            )
+        ]
+        if failures:
+            raise CommandError("Budgets exceeded:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All budgets met"))
+
+    def run_dataset(self, name: str, options: dict) -> dict:
+        """Seed ``name`` into the empty test database and run the scenarios"""
+        self.stdout.write(f"Seeding {name} dataset")
+        data = benchmarks.seed_dataset(benchmarks.DATASETS[name])
+        results = benchmarks.run_scenarios(
+            data, options["repeat"], options["scenarios"], options["warmup"]
+        )
+
+        self.stdout.write(
+            f"{name:<22}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'peak KiB':>11}"
+        )
+        for scenario, result in results.items():
+            self.stdout.write(
+                f"  {scenario:<20}{result.queries:>8}{result.p50_ms:>10}"
+                f"{result.p95_ms:>10}{result.peak_kb:>11}"
+            )
+        return results
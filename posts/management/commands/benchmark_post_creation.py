@@ -0,0 +1,65 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import buffer
+from posts.tasks import create_post
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare worker throughput of one create_post task per post with "
+        "the coalescing buffer drain for the same number of queued posts. "
+        "Task bodies run in-process, so broker transport is not included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10_000)
+        parser.add_argument(
+            "--batch-size", type=int, default=buffer.get_batch_size()
+        )
+
+    def report(self, mode: str, count: int, seconds: float) -> float:
+        rate = count / seconds
+        self.stdout.write(
+            f"{mode:>6}: {count} posts in {seconds:.2f}s, {rate:.0f} posts/s"
+        )
+        return rate
+
+    def handle(self, *args, **options):
+        count, batch_size = options["tasks"], options["batch_size"]
+        owner = get_user_model().objects.create_user(
+            f"benchmark-{uuid.uuid4().hex}@example.com", uuid.uuid4().hex
+        )
+        try:
+            started = time.perf_counter()
+            for index in range(count):
+                create_post(f"single {index}", "benchmark", owner.id)
+            single = self.report(
+                "single", count, time.perf_counter() - started
+            )
+
+            items = [
+                buffer.BufferedPost(
+                    owner_id=owner.id,
+                    title=f"batch {index}",
+                    content="benchmark",
+                    created_time=timezone.now().isoformat(),
+                )
+                for index in range(count)
+            ]
+            started = time.perf_counter()
+            for start in range(0, count, batch_size):
+                buffer.create_buffered_posts(
+                    items[start:start + batch_size]
+                )
+            batch = self.report("batch", count, time.perf_counter() - started)
+        finally:
+            owner.delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Batch mode is {batch / single:.1f}x faster")
+        )
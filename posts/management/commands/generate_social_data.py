@@ -0,0 +1,342 @@
+"""
+Generate a large, deterministic social network for performance work.
+
+Popularity follows a Zipf law: a few celebrities are followed by a large
+share of users and get most of the comments and reactions, while most
+users have a handful of followers. Out-degrees are Pareto distributed
+around ``--follows``. The same ``--seed`` and options always produce the
+same graph and content.
+
+Rows are written with ``executemany`` in batches and explicit primary
+keys, which skips model instantiation and lets the follow graph go
+straight into the ``followers`` / ``following`` through tables. Post
+counters are computed in memory and inserted with the posts; home
+timelines stay cold and are rebuilt on first read.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Iterable, Sequence
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from comments.models import Commentary
+from likes.models import Reaction
+from posts.models import Post
+from profiles.models import Profile
+from social_media_api.generations import bump_generation
+
+WORDS = (
+    "api django redis celery post feed like follow cache index query "
+    "timeline comment profile photo travel coffee music code weekend "
+    "sunset city launch update release team story morning news"
+).split()
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    """Cumulative weights of ranks 1..count under a Zipf law"""
+    return list(
+        accumulate(1 / rank**exponent for rank in range(1, count + 1))
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert a seeded synthetic social network: users, profiles, "
+        "a power-law follow graph, posts, comments and reactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--posts", type=int, default=10_000)
+        parser.add_argument("--comments", type=int, default=20_000)
+        parser.add_argument("--reactions", type=int, default=50_000)
+        parser.add_argument(
+            "--follows",
+            type=int,
+            default=20,
+            help="Average number of users every user follows",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--until",
+            default="2023-06-01",
+            help="Date of the newest generated content (YYYY-MM-DD)",
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--password", default="social1849")
+
+    def handle(self, *args, **options):
+        if options["users"] < 2:
+            raise CommandError("--users must be at least 2")
+        try:
+            until = timezone.make_aware(
+                datetime.strptime(options["until"], "%Y-%m-%d")
+            )
+        except ValueError as error:
+            raise CommandError("--until must be a YYYY-MM-DD date") from error
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.until = until
+        self.span = options["days"] * 86400
+        started = time.perf_counter()
+        self.total = 0
+
+        users = self.create_users(options["users"], options["password"])
+        self.create_follow_graph(users, options["follows"])
+        self.create_activity(
+            users, options["posts"], options["comments"], options["reactions"]
+        )
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(),
+                [get_user_model(), Profile, Post, Commentary, Reaction],
+            ):
+                cursor.execute(sql)
+        bump_generation("posts", "profiles")
+        seconds = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {self.total} rows in {seconds:.1f}s, "
+                f"{self.total / seconds:.0f} rows/s"
+            )
+        )
+
+    def insert(
+        self, model, fields: Sequence[str], rows: Iterable[Sequence]
+    ) -> int:
+        """Insert ``rows`` of ``fields`` values with batched executemany"""
+        opts = model._meta
+        quote = connection.ops.quote_name
+        columns = [opts.get_field(field).column for field in fields]
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote(opts.db_table),
+            ", ".join(quote(column) for column in columns),
+            ", ".join(["%s"] * len(columns)),
+        )
+        started = time.perf_counter()
+        inserted = 0
+        batch = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    cursor.executemany(sql, batch)
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                cursor.executemany(sql, batch)
+                inserted += len(batch)
+        seconds = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(
+            f"{opts.label:>30}: {inserted} rows, "
+            f"{inserted / seconds:.0f} rows/s"
+        )
+        self.total += inserted
+        return inserted
+
+    def next_id(self, model) -> int:
+        return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+    def at(self, offset: float):
+        """Database value of the moment ``offset`` seconds into the span"""
+        return self.db_datetime(
+            self.until - timedelta(seconds=self.span - offset)
+        )
+
+    def after(self, offset: float):
+        """Database value of a random moment after ``offset``"""
+        return self.at(offset + self.rng.random() * (self.span - offset))
+
+    def db_datetime(self, value: datetime):
+        return connection.ops.adapt_datetimefield_value(value)
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=count))
+
+    def create_users(self, count: int, password: str) -> list[int]:
+        """Users and their profiles, most popular first"""
+        user_model = get_user_model()
+        first_user = self.next_id(user_model)
+        first_profile = self.next_id(Profile)
+        users = list(range(first_user, first_user + count))
+        hashed = make_password(password)
+        joined = self.db_datetime(self.until - timedelta(seconds=self.span))
+        self.insert(
+            user_model,
+            [
+                "id",
+                "password",
+                "is_superuser",
+                "email",
+                "is_staff",
+                "is_active",
+                "date_joined",
+                "first_name",
+                "last_name",
+            ],
+            (
+                (
+                    user_id,
+                    hashed,
+                    False,
+                    f"user{user_id}@example.com",
+                    False,
+                    True,
+                    joined,
+                    "",
+                    "",
+                )
+                for user_id in users
+            ),
+        )
+        self.profiles = {
+            user_id: first_profile + index
+            for index, user_id in enumerate(users)
+        }
+        updated = self.db_datetime(self.until)
+        self.insert(
+            Profile,
+            ["id", "user", "username", "bio", "location", "updated_at"],
+            (
+                (
+                    profile_id,
+                    user_id,
+                    f"user{user_id}",
+                    self.words(6),
+                    self.rng.choice(WORDS).title(),
+                    updated,
+                )
+                for user_id, profile_id in self.profiles.items()
+            ),
+        )
+        self.rng.shuffle(users)
+        return users
+
+    def create_follow_graph(self, users: list[int], follows: int) -> None:
+        """
+        Every user follows a Pareto-distributed number of others, picked
+        with Zipf weights so the first users become celebrities
+        """
+        weights = zipf_weights(len(users), 1.0)
+        edges = []
+        for follower in users:
+            wanted = min(
+                len(users) - 1,
+                int(self.rng.paretovariate(1.5) * follows / 3),
+            )
+            targets = set(
+                self.rng.choices(users, cum_weights=weights, k=wanted)
+            )
+            targets.discard(follower)
+            edges.extend((follower, target) for target in sorted(targets))
+
+        for field, rows in (
+            (
+                Profile.following,
+                ((self.profiles[user], target) for user, target in edges),
+            ),
+            (
+                Profile.followers,
+                ((self.profiles[target], user) for user, target in edges),
+            ),
+        ):
+            through = field.through
+            self.insert(
+                through,
+                [
+                    field.field.m2m_field_name(),
+                    field.field.m2m_reverse_field_name(),
+                ],
+                rows,
+            )
+
+    def create_activity(
+        self, users: list[int], posts: int, comments: int, reactions: int
+    ) -> None:
+        """Posts with their counters, then their comments and reactions"""
+        owners = self.rng.choices(
+            users, cum_weights=zipf_weights(len(users), 0.5), k=posts
+        )
+        offsets = [self.rng.random() * self.span for _ in range(posts)]
+        # Viral posts come from popular owners.
+        rank = {user: index for index, user in enumerate(users)}
+        post_weights = list(
+            accumulate(1 / (rank[owner] + 1) for owner in owners)
+        )
+        commented = self.rng.choices(
+            range(posts), cum_weights=post_weights, k=comments
+        )
+        reacted = {}
+        for _ in range(reactions):
+            post = self.rng.choices(range(posts), cum_weights=post_weights)[0]
+            reacted[(post, self.rng.choice(users))] = (
+                Reaction.Value.LIKE
+                if self.rng.random() < 0.85
+                else Reaction.Value.DISLIKE
+            )
+
+        counters = [[0, 0, 0] for _ in range(posts)]
+        for post in commented:
+            counters[post][2] += 1
+        for (post, _), value in reacted.items():
+            counters[post][0 if value == Reaction.Value.LIKE else 1] += 1
+
+        first_post = self.next_id(Post)
+        updated = self.db_datetime(self.until)
+        self.insert(
+            Post,
+            [
+                "id",
+                "owner",
+                "title",
+                "content",
+                "created_time",
+                "likes_count",
+                "dislikes_count",
+                "comments_count",
+                "updated_at",
+            ],
+            (
+                (
+                    first_post + index,
+                    owner,
+                    self.words(4).capitalize(),
+                    self.words(30),
+                    self.at(offsets[index]),
+                    *counters[index],
+                    updated,
+                )
+                for index, owner in enumerate(owners)
+            ),
+        )
+        self.insert(
+            Commentary,
+            ["post", "user", "content", "created_time"],
+            (
+                (
+                    first_post + post,
+                    self.rng.choice(users),
+                    self.words(12),
+                    self.after(offsets[post]),
+                )
+                for post in commented
+            ),
+        )
+        self.insert(
+            Reaction,
+            ["post", "user", "value"],
+            (
+                (first_post + post, user, value)
+                for (post, user), value in reacted.items()
+            ),
+        )
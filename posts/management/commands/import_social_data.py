@@ -0,0 +1,186 @@
+"""
+Stream a ``dumpdata``-style JSON fixture into the database.
+
+Unlike ``loaddata`` the fixture is never loaded whole: objects are
+decoded one at a time from the array, grouped per model and inserted
+with ``bulk_create`` a batch at a time, many-to-many links go straight
+into the auto-created through tables. Rows are inserted in the order
+their models first appear, so a fixture dumped in dependency order loads
+as is. Passwords that are already hashed are stored untouched.
+"""
+import json
+import time
+from typing import IO, Iterator
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+
+from comments.models import Commentary
+from likes.models import Reaction
+from posts.counters import rebuild_post_counters
+from posts.models import Post
+from social_media_api.generations import bump_generation
+
+READ_SIZE = 1 << 16
+MAX_OBJECT_SIZE = 1 << 24
+WHITESPACE = " \t\n\r"
+
+
+def iter_fixture(stream: IO[str], read_size: int = READ_SIZE) -> Iterator:
+    """Decode the objects of a JSON array one by one from ``stream``"""
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    state = "start"
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise CommandError("Unexpected end of fixture")
+            buffer, position = stream.read(read_size), 0
+            eof = not buffer
+            continue
+        char = buffer[position]
+        if state == "start":
+            if char != "[":
+                raise CommandError("Fixture must be a JSON array")
+            state, position = "first", position + 1
+        elif char == "]" and state in ("first", "next"):
+            return
+        elif state == "next":
+            if char != ",":
+                raise CommandError(f"Unexpected {char!r} in fixture")
+            state, position = "value", position + 1
+        elif char != "{":
+            raise CommandError("Fixture items must be objects")
+        else:
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                # Most likely the object continues in the next chunk
+                if eof:
+                    raise CommandError("Invalid JSON in fixture") from error
+                if len(buffer) - position > MAX_OBJECT_SIZE:
+                    raise CommandError(
+                        "Fixture object is too large"
+                    ) from error
+                chunk = stream.read(read_size)
+                buffer, position = buffer[position:] + chunk, 0
+                eof = not chunk
+                continue
+            state = "next"
+            yield item
+
+
+def hash_password(user) -> None:
+    """Hash a plain-text fixture password, keep already hashed ones"""
+    if not user.password:
+        return
+    try:
+        identify_hasher(user.password)
+    except ValueError:
+        user.password = make_password(user.password)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a dumpdata-style JSON fixture (like social_media_data.json) "
+        "with batched bulk inserts, streaming it instead of loading it "
+        "into memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.batch_size = options["batch_size"]
+        self.rows: dict[type[models.Model], list[models.Model]] = {}
+        self.links: dict[type[models.Model], list[models.Model]] = {}
+        self.buffered = 0
+        self.counts: dict[str, int] = {}
+        self.started = time.perf_counter()
+        user_model = get_user_model()
+
+        try:
+            stream = open(options["fixture"], encoding="utf-8")
+        except OSError as error:
+            raise CommandError(error) from error
+        with stream:
+            for deserialized in serializers.deserialize(
+                "python", iter_fixture(stream), ignorenonexistent=True
+            ):
+                instance = deserialized.object
+                if isinstance(instance, user_model):
+                    hash_password(instance)
+                self.add(instance, deserialized.m2m_data or {})
+                if self.buffered >= self.batch_size:
+                    self.flush()
+        self.flush()
+        self.finish()
+
+    def add(self, instance: models.Model, m2m_data: dict) -> None:
+        model = type(instance)
+        self.rows.setdefault(model, []).append(instance)
+        self.buffered += 1
+        for name, values in m2m_data.items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(field.m2m_reverse_name()).attname
+            self.links.setdefault(through, []).extend(
+                through(**{source: instance.pk, target: value})
+                for value in values
+            )
+            self.buffered += len(values)
+
+    def flush(self) -> None:
+        """Insert every buffered row and link in one transaction"""
+        if not self.buffered:
+            return
+        with transaction.atomic():
+            for group in (self.rows, self.links):
+                for model, instances in group.items():
+                    if not instances:
+                        continue
+                    model.objects.bulk_create(
+                        instances,
+                        batch_size=self.batch_size,
+                        ignore_conflicts=group is self.links,
+                    )
+                    label = model._meta.label
+                    self.counts[label] = (
+                        self.counts.get(label, 0) + len(instances)
+                    )
+                    instances.clear()
+        self.buffered = 0
+        total = sum(self.counts.values())
+        self.stdout.write(f"{total} rows, {self.rate(total):.0f} rows/s")
+
+    def rate(self, rows: int) -> float:
+        return rows / max(time.perf_counter() - self.started, 1e-9)
+
+    def finish(self) -> None:
+        """Reset sequences and derived data after rows with explicit pks"""
+        imported = list(self.rows)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), imported
+            ):
+                cursor.execute(sql)
+        if {Post, Commentary, Reaction} & set(imported):
+            rebuild_post_counters()
+        bump_generation("posts", "profiles")
+
+        for label, count in self.counts.items():
+            self.stdout.write(f"{label:>30}: {count}")
+        total = sum(self.counts.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total} rows, {self.rate(total):.0f} rows/s"
+            )
+        )
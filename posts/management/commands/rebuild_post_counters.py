@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_post_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute likes, dislikes and comments counters of all posts"
+
+    def handle(self, *args, **options):
+        fixed = rebuild_post_counters()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt counters, {fixed} posts fixed")
+        )
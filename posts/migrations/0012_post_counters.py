@@ -0,0 +1,49 @@
+# Generated by Django 4.2.1 on 2026-10-18 18:06
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    sources = {
+        "likes_count": apps.get_model("likes", "Like"),
+        "dislikes_count": apps.get_model("likes", "Dislike"),
+        "comments_count": apps.get_model("comments", "Commentary"),
+    }
+    for field, model in sources.items():
+        totals = (
+            model.objects.order_by()
+            .values_list("post_id")
+            .annotate(total=Count("pk"))
+            .values_list("post_id", "total")
+        )
+        for post_id, total in totals:
+            Post.objects.filter(pk=post_id).update(**{field: total})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0011_timelineentry"),
+        ("likes", "0015_dislike"),
+        ("comments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="dislikes_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
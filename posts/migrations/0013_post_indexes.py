@@ -0,0 +1,25 @@
+# Generated by Django 4.2.1 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("posts", "0012_post_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["owner", "-created_time", "-id"],
+                name="post_owner_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_time", "-id"], name="post_recent_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
 from social_media_api import settings
 from django.utils import timezone
 
@@ -10,6 +12,101 @@ class Post(models.Model):
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="post"
     )
+    likes_count = models.IntegerField(default=0)
+    dislikes_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_time", "-id"],
+                name="post_owner_recent_idx",
+            ),
+            models.Index(
+                fields=["-created_time", "-id"], name="post_recent_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title}"
+
+
+class TimelineEntry(models.Model):
+    """A post materialized into a follower's home timeline."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    created_time = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_time", "-post"],
+                name="timeline_user_recent_idx",
+            ),
+        ]
+
+
+class ScheduledPost(models.Model):
+    """A post waiting for its publish time, published by a beat task."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="scheduled_posts",
+    )
+    title = models.CharField(max_length=63)
+    content = models.TextField()
+    publish_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["publish_at", "id"], name="scheduled_post_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.title} at {self.publish_at}"
+
+
+class AppliedBatch(models.Model):
+    """
+    Key of a Redis batch written to the database, stored in the same
+    transaction so a batch retried after a crash is not applied twice.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    applied_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    @classmethod
+    def record(cls, key: str) -> bool:
+        """
+        Record ``key`` in the current transaction; False if a batch with
+        this key was applied already
+        """
+        try:
+            with transaction.atomic():
+                cls.objects.create(key=key)
+        except IntegrityError:
+            return False
+        return True
+
+    @classmethod
+    def prune(cls) -> None:
+        """Forget batches applied long before any retry could come"""
+        cls.objects.filter(
+            applied_at__lt=timezone.now() - timedelta(days=1)
+        ).delete()
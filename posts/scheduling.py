@@ -0,0 +1,91 @@
+"""
+Database-backed scheduled posts.
+
+Scheduling a post is a single insert into ``ScheduledPost``; a periodic
+beat task claims the rows that are due in batches and publishes them with
+``bulk_create``, so no broker message waits for weeks for its countdown.
+Claimed rows are deleted in the same transaction that publishes them,
+which makes a crashed tick roll back and leave them for the next one.
+"""
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from posts.bulk import BATCH_SIZE, PostItem, insert_posts
+from posts.models import Post, ScheduledPost
+
+
+def get_publish_batch_size() -> int:
+    return getattr(settings, "SCHEDULED_POSTS_BATCH_SIZE", 1000)
+
+
+def schedule_posts(
+    owner_id: int, items: Iterable[PostItem]
+) -> list[ScheduledPost]:
+    """Store posts to be published at their created_time"""
+    return ScheduledPost.objects.bulk_create(
+        [
+            ScheduledPost(
+                owner_id=owner_id,
+                title=item["title"],
+                content=item["content"],
+                publish_at=item["created_time"],
+            )
+            for item in items
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def claim_due(batch_size: int) -> list[ScheduledPost]:
+    """
+    Remove and return up to ``batch_size`` due rows, oldest first. Must
+    run inside a transaction so the rows come back if publishing fails.
+    """
+    now = timezone.now()
+    if connection.features.has_select_for_update_skip_locked:
+        claimed = list(
+            ScheduledPost.objects.select_for_update(skip_locked=True)
+            .filter(publish_at__lte=now)
+            .order_by("publish_at", "id")[:batch_size]
+        )
+        ScheduledPost.objects.filter(
+            id__in=[row.id for row in claimed]
+        ).delete()
+        return claimed
+    # Without row locks (SQLite) the DELETE takes the database write lock
+    # first, so concurrent ticks can never claim the same row twice.
+    table = ScheduledPost._meta.db_table
+    return list(
+        ScheduledPost.objects.raw(
+            f"DELETE FROM {table} WHERE id IN ("
+            f"SELECT id FROM {table} WHERE publish_at <= %s "
+            "ORDER BY publish_at, id LIMIT %s) "
+            "RETURNING id, owner_id, title, content, publish_at",
+            [now, batch_size],
+        )
+    )
+
+
+def publish_due(max_batches: int = 10) -> int:
+    """Publish due scheduled posts batch by batch, return how many"""
+    batch_size = get_publish_batch_size()
+    published = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            claimed = claim_due(batch_size)
+            insert_posts([
+                Post(
+                    owner_id=row.owner_id,
+                    title=row.title,
+                    content=row.content,
+                    created_time=row.publish_at,
+                )
+                for row in claimed
+            ])
+        published += len(claimed)
+        if len(claimed) < batch_size:
+            break
+    return published
@@ -0,0 +1,265 @@
+"""
+Full-text search over post titles and contents.
+
+On SQLite posts are indexed by an FTS5 external-content table kept in
+sync by triggers on ``posts_post``; on PostgreSQL by a GIN index over a
+weighted ``tsvector`` expression. Both are (re)installed idempotently
+after every ``migrate`` rather than by a migration, because SQLite
+migrations that rebuild ``posts_post`` silently drop its triggers.
+
+``get_search_backend()`` returns the backend configured with
+``POST_SEARCH_BACKEND`` or the one matching the database vendor.
+"""
+import re
+from html import escape
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.db.models import BooleanField, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from posts.models import Post
+
+TOKEN_RE = re.compile(r"\w+")
+MARK_START, MARK_END = "\x02", "\x03"
+
+
+class SearchHit(NamedTuple):
+    post_id: int
+    rank: float
+    title: str
+    snippet: str
+
+
+def tokenize(query: str) -> list[str]:
+    return TOKEN_RE.findall(query.lower())
+
+
+def render_highlight(text: Optional[str]) -> str:
+    """Escape user content and turn the match markers into <mark> tags"""
+    return (
+        escape(text or "")
+        .replace(MARK_START, "<mark>")
+        .replace(MARK_END, "</mark>")
+    )
+
+
+class BaseSearchBackend:
+    def __init__(self, alias: str = DEFAULT_DB_ALIAS) -> None:
+        self.connection = connections[alias]
+
+    def install(self) -> None:
+        """Create the index structures if they are missing"""
+
+    def search(self, query: str, limit: int) -> list[SearchHit]:
+        """Best matches for ``query`` in title or content, best first"""
+        raise NotImplementedError
+
+    def filter(
+        self, queryset: QuerySet[Post], query: str, title_only=False
+    ) -> QuerySet[Post]:
+        """Restrict ``queryset`` to posts matching every token prefix"""
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    table = "posts_post_fts"
+    install_sql = [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON posts_post
+        BEGIN
+            INSERT INTO {table}(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON posts_post
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_au
+        AFTER UPDATE OF title, content ON posts_post
+        BEGIN
+            INSERT INTO {table}({table}, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO {table}(rowid, title, content)
+            VALUES (new.id, new.title, new.content);
+        END
+        """,
+    ]
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            exists = self.table in self.connection.introspection.table_names(
+                cursor
+            )
+            if not exists:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {self.table} USING fts5("
+                    "title, content, content='posts_post', "
+                    "content_rowid='id', "
+                    "tokenize='unicode61 remove_diacritics 2', "
+                    "prefix='2 3')"
+                )
+            for statement in self.install_sql:
+                cursor.execute(statement)
+            if not exists:
+                cursor.execute(
+                    f"INSERT INTO {self.table}({self.table}) "
+                    "VALUES ('rebuild')"
+                )
+
+    @staticmethod
+    def match_expression(tokens: list[str], title_only=False) -> str:
+        # FTS5 strings are quoted with " and escape it by doubling it
+        expression = " ".join(
+            '"' + token.replace('"', '""') + '"*' for token in tokens
+        )
+        if title_only:
+            return f"title : ({expression})"
+        return expression
+
+    def search(self, query: str, limit: int) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({self.table}, 10.0, 1.0) AS rank, "
+                f"highlight({self.table}, 0, %s, %s), "
+                f"snippet({self.table}, 1, %s, %s, '…', 16) "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                "ORDER BY rank LIMIT %s",
+                [
+                    MARK_START,
+                    MARK_END,
+                    MARK_START,
+                    MARK_END,
+                    self.match_expression(tokens),
+                    limit,
+                ],
+            )
+            return [
+                SearchHit(post_id, -rank, title, snippet)
+                for post_id, rank, title, snippet in cursor.fetchall()
+            ]
+
+    def filter(
+        self, queryset: QuerySet[Post], query: str, title_only=False
+    ) -> QuerySet[Post]:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {self.table} "
+                f"WHERE {self.table} MATCH %s",
+                [self.match_expression(tokens, title_only)],
+            )
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    index = "posts_post_search_idx"
+
+    @property
+    def config(self) -> str:
+        return getattr(settings, "POST_SEARCH_CONFIG", "english")
+
+    @property
+    def config_literal(self) -> str:
+        """The text search configuration as an SQL string literal"""
+        return "'" + self.config.replace("'", "''") + "'"
+
+    @property
+    def vector(self) -> str:
+        return (
+            f"(setweight(to_tsvector({self.config_literal}, "
+            "coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector({self.config_literal}, "
+            "coalesce(content, '')), 'B'))"
+        )
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.index} "
+                f"ON posts_post USING GIN ({self.vector})"
+            )
+
+    @staticmethod
+    def tsquery(tokens: list[str], title_only=False) -> str:
+        weight = "A" if title_only else ""
+        return " & ".join(f"{token}:*{weight}" for token in tokens)
+
+    def search(self, query: str, limit: int) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        headline = f"StartSel={MARK_START}, StopSel={MARK_END}"
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id, ts_rank_cd({self.vector}, query) AS rank, "
+                f"ts_headline({self.config_literal}, title, query, %s), "
+                f"ts_headline({self.config_literal}, content, query, %s) "
+                "FROM posts_post, "
+                f"to_tsquery({self.config_literal}, %s) query "
+                f"WHERE {self.vector} @@ query "
+                "ORDER BY rank DESC, id DESC LIMIT %s",
+                [
+                    f"{headline}, HighlightAll=true",
+                    f"{headline}, MaxWords=16, MinWords=5",
+                    self.tsquery(tokens),
+                    limit,
+                ],
+            )
+            return [SearchHit(*row) for row in cursor.fetchall()]
+
+    def filter(
+        self, queryset: QuerySet[Post], query: str, title_only=False
+    ) -> QuerySet[Post]:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        return queryset.filter(
+            RawSQL(
+                f"{self.vector} @@ to_tsquery({self.config_literal}, %s)",
+                [self.tsquery(tokens, title_only)],
+                output_field=BooleanField(),
+            )
+        )
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(alias: str = DEFAULT_DB_ALIAS) -> BaseSearchBackend:
+    backend_path = getattr(settings, "POST_SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)(alias)
+    vendor = connections[alias].vendor
+    try:
+        return VENDOR_BACKENDS[vendor](alias)
+    except KeyError as error:
+        raise ImproperlyConfigured(
+            f"No post search backend for the {vendor} database, "
+            "set POST_SEARCH_BACKEND"
+        ) from error
+
+
+def install_search_index(sender, using: str = DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver installing the search index of ``using``"""
+    if (
+        getattr(settings, "POST_SEARCH_BACKEND", None)
+        or connections[using].vendor in VENDOR_BACKENDS
+    ):
+        get_search_backend(using).install()
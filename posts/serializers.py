@@ -1,19 +1,66 @@
-from typing import Optional
+from typing import Optional, Union
 
+from django.db.models import QuerySet
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 from comments.serializers import CommentarySerializer
-from likes.serializers import LikeSerializer, DislikeSerializer
+from likes.models import Reaction
+from likes.serializers import ReactionSerializer
+from posts import counter_buffer
+from social_media_api.pagination import (
+    CommentaryPagination,
+    KeysetPagination,
+    ReactionPagination,
+)
 from .models import Post
 
+NESTED_LIMIT = 10
+NESTED_PAGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "count": {"type": "integer"},
+        "next": {"type": "string", "nullable": True},
+        "results": {"type": "array", "items": {"type": "object"}},
+    },
+}
 
-class PostSerializer(serializers.ModelSerializer):
-    comments = serializers.IntegerField(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    dislikes_count = serializers.SerializerMethodField()
+
+class BatchListSerializer(serializers.ListSerializer):
+    """Let the child prepare every item of a page with one batch call"""
+
+    def to_representation(self, data) -> list:
+        items = list(data.all() if hasattr(data, "all") else data)
+        self.child.prepare_batch(items)
+        return super().to_representation(items)
+
+
+class PendingCountersMixin:
+    """Show reaction counters including deltas not flushed yet"""
+
+    def prepare_batch(self, posts: list[Post]) -> None:
+        counter_buffer.apply_pending(posts)
+
+    def to_representation(self, instance: Post) -> dict:
+        self.prepare_batch([instance])
+        return super().to_representation(instance)
+
+
+class PostSerializer(PendingCountersMixin, serializers.ModelSerializer):
+    """
+    Post with its counters and ``my_reaction``, the requesting user's
+    "like", "dislike" or null, looked up for a whole page in one query.
+    """
+
+    comments = serializers.IntegerField(
+        source="comments_count", read_only=True
+    )
+    my_reaction = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
+        list_serializer_class = BatchListSerializer
         fields = [
             "id",
             "owner",
@@ -23,32 +70,58 @@ class PostSerializer(serializers.ModelSerializer):
             "comments",
             "likes_count",
             "dislikes_count",
+            "my_reaction",
         ]
+        read_only_fields = ["likes_count", "dislikes_count"]
 
-    @staticmethod
-    def get_likes_count(instance: Post) -> Optional[int]:
-        """This method count all likes"""
-        return instance.likes.count()
+    def prepare_batch(self, posts: list[Post]) -> None:
+        super().prepare_batch(posts)
+        posts = [post for post in posts if not hasattr(post, "my_reaction")]
+        request = self.context.get("request")
+        user_id = request and request.user.pk
+        values = {}
+        if posts and user_id:
+            values = dict(
+                Reaction.objects.filter(
+                    user_id=user_id, post_id__in=[post.id for post in posts]
+                ).values_list("post_id", "value")
+            )
+        for post in posts:
+            post.my_reaction = values.get(post.id)
 
-    @staticmethod
-    def get_dislikes_count(instance: Post) -> Optional[int]:
-        """This method count all dislikes"""
-        return instance.dislikes.count()
+    @extend_schema_field(
+        serializers.ChoiceField(choices=["like", "dislike"], allow_null=True)
+    )
+    def get_my_reaction(self, obj: Post) -> Optional[str]:
+        value = getattr(obj, "my_reaction", None)
+        return value and Reaction.Value(value).name.lower()
 
-    def to_representation(self, instance: Post) -> dict:
-        """
-        Override the default to_representation method to add the comments_count
-        field to the serialized output.
-        """
-        data = super().to_representation(instance)
-        data["comments"] = instance.commentaries.count()
-        return data
 
+class PostSearchSerializer(PostSerializer):
+    rank = serializers.FloatField(read_only=True)
+    highlighted_title = serializers.CharField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
 
-class PostDetailSerializer(serializers.ModelSerializer):
-    commentaries = CommentarySerializer(many=True, read_only=True)
-    likes = LikeSerializer(many=True, read_only=True)
-    dislikes = DislikeSerializer(many=True, read_only=True)
+    class Meta(PostSerializer.Meta):
+        fields = PostSerializer.Meta.fields + [
+            "rank",
+            "highlighted_title",
+            "snippet",
+        ]
+
+
+class PostDetailSerializer(
+    PendingCountersMixin, serializers.ModelSerializer
+):
+    """
+    Post with the first NESTED_LIMIT commentaries, likes and dislikes.
+    Every collection carries its total count and a link to the next page
+    of its own paginated endpoint, so viral posts stay cheap to render.
+    """
+
+    commentaries = serializers.SerializerMethodField()
+    likes = serializers.SerializerMethodField()
+    dislikes = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -63,6 +136,89 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "dislikes"
         ]
 
+    @staticmethod
+    def first_items(
+        instance: Post, prefetched_attr: str, queryset: QuerySet
+    ) -> Union[list, QuerySet]:
+        """Items prefetched by the view, or ``queryset`` otherwise"""
+        prefetched = getattr(instance, prefetched_attr, None)
+        return queryset if prefetched is None else prefetched
+
+    def nested_page(
+        self,
+        instance: Post,
+        items: Union[list, QuerySet],
+        count: int,
+        serializer_class: type[serializers.Serializer],
+        paginator: KeysetPagination,
+        url_name: str,
+    ) -> dict:
+        items = list(items[:NESTED_LIMIT])
+        next_link = None
+        if count > len(items) and items:
+            url = reverse(
+                url_name,
+                kwargs={"pk": instance.pk},
+                request=self.context.get("request"),
+            )
+            next_link = paginator.get_link_after(url, items[-1])
+        return {
+            "count": count,
+            "next": next_link,
+            "results": serializer_class(
+                items, many=True, context=self.context
+            ).data,
+        }
+
+    @extend_schema_field(NESTED_PAGE_SCHEMA)
+    def get_commentaries(self, instance: Post) -> dict:
+        return self.nested_page(
+            instance,
+            self.first_items(
+                instance,
+                "first_commentaries",
+                instance.commentaries.order_by("created_time", "id"),
+            ),
+            instance.comments_count,
+            CommentarySerializer,
+            CommentaryPagination(),
+            "posts:post_list-comments",
+        )
+
+    @extend_schema_field(NESTED_PAGE_SCHEMA)
+    def get_likes(self, instance: Post) -> dict:
+        return self.nested_page(
+            instance,
+            self.first_items(
+                instance,
+                "first_likes",
+                instance.reactions.filter(
+                    value=Reaction.Value.LIKE
+                ).order_by("id"),
+            ),
+            instance.likes_count,
+            ReactionSerializer,
+            ReactionPagination(),
+            "posts:post_list-likes",
+        )
+
+    @extend_schema_field(NESTED_PAGE_SCHEMA)
+    def get_dislikes(self, instance: Post) -> dict:
+        return self.nested_page(
+            instance,
+            self.first_items(
+                instance,
+                "first_dislikes",
+                instance.reactions.filter(
+                    value=Reaction.Value.DISLIKE
+                ).order_by("id"),
+            ),
+            instance.dislikes_count,
+            ReactionSerializer,
+            ReactionPagination(),
+            "posts:post_list-dislikes",
+        )
+
 
 class PostCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -74,6 +230,22 @@ class PostCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+class PostBulkCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Post
+        fields = [
+            "title",
+            "content",
+            "created_time",
+        ]
+        extra_kwargs = {"created_time": {"required": False}}
+
+
+class PostBulkCreateResultSerializer(serializers.Serializer):
+    created = serializers.ListField(child=serializers.IntegerField())
+    scheduled = serializers.IntegerField()
+
+
 class PostCreateWithoutWorkerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
@@ -81,3 +253,10 @@ class PostCreateWithoutWorkerSerializer(serializers.ModelSerializer):
             "title",
             "content",
         ]
+
+
+class ReactionStateSerializer(serializers.Serializer):
+    liked = serializers.BooleanField()
+    disliked = serializers.BooleanField()
+    likes_count = serializers.IntegerField()
+    dislikes_count = serializers.IntegerField()
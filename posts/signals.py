@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Post
+from posts.tasks import queue_fan_out
+from social_media_api.generations import bump_generation
+
+
+@receiver(post_save, sender=Post)
+def fan_out_created_post(
+    sender, instance: Post, created: bool, raw: bool = False, **kwargs
+) -> None:
+    """Push every newly created post into its owner's followers timelines"""
+    if created and not raw:
+        transaction.on_commit(lambda: queue_fan_out([instance.id]))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_posts_generation(sender, **kwargs) -> None:
+    bump_generation("posts")
@@ -2,8 +2,14 @@ from datetime import datetime
 
 from celery import shared_task
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
 
-from posts.models import Post
+from posts import buffer, counter_buffer, timeline
+from posts.models import Post, ScheduledPost
+from posts.scheduling import publish_due
+from social_media_api.broker import is_broker_available, record_failure
 
 
 @shared_task
@@ -12,11 +18,16 @@ def create_post_on_a_specific_date(
 ) -> None:
     """
     Task to create a post on a specific date and time.
+    Kept for messages queued before scheduled posts moved to the
+    database: it only stores the post for the publisher.
     """
-    owner = get_user_model().objects.get(id=owner_id)
     scheduled_time = datetime.strptime(eta, "%Y-%m-%dT%H:%M:%S")
-    delay = (scheduled_time - datetime.now()).total_seconds()
-    create_post.apply_async(args=[title, content, owner.id], countdown=delay)
+    ScheduledPost.objects.create(
+        owner_id=owner_id,
+        title=title,
+        content=content,
+        publish_at=timezone.make_aware(scheduled_time),
+    )
 
 
 @shared_task
@@ -26,3 +37,66 @@ def create_post(title: str, content: str, owner_id: str) -> None:
     """
     owner = get_user_model().objects.get(id=owner_id)
     Post.objects.create(title=title, content=content, owner=owner)
+
+
+@shared_task
+def publish_scheduled_posts() -> int:
+    """
+    Periodic task publishing every scheduled post that is due.
+    """
+    return publish_due()
+
+
+@shared_task
+def flush_post_counters() -> int:
+    """
+    Periodic task writing buffered reaction counter deltas to posts.
+    """
+    return counter_buffer.flush()
+
+
+@shared_task
+def drain_post_buffer() -> int:
+    """
+    Task to create every post waiting in the coalescing buffer.
+    """
+    return buffer.drain()
+
+
+@shared_task
+def fan_out_posts(post_ids: list[int]) -> None:
+    """
+    Task to copy new posts into their owners' followers timelines.
+    """
+    timeline.fan_out_posts(
+        Post.objects.filter(id__in=post_ids).only(
+            "id", "owner_id", "created_time"
+        )
+    )
+
+
+def queue_fan_out(post_ids: list[int]) -> None:
+    """
+    Fan new posts out on the worker, so creating a post by a user with
+    many followers stays fast. If the broker is not available, or the
+    message cannot be sent, the posts are fanned out immediately.
+    """
+    if is_broker_available():
+        try:
+            fan_out_posts.delay(post_ids)
+            return
+        except (OperationalError, RedisError):
+            record_failure()
+    fan_out_posts(post_ids)
+
+
+def queue_post(title: str, content: str, owner_id: int) -> None:
+    """
+    Queue a post for the worker: as its own create_post message, or
+    appended to the buffer in the "batch" POST_CREATE_MODE, where only
+    the first post of an empty buffer sends a drain message.
+    """
+    if buffer.get_create_mode() != "batch":
+        create_post.delay(title, content, owner_id)
+    elif buffer.push(owner_id, title, content) == 1:
+        drain_post_buffer.delay()
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from social_media_api import benchmarks, broker
+from social_media_api.benchmarks import DatasetSize, Result
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(broker, "monitor", available=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_scenario_runs_against_a_seeded_dataset(self):
+        data = benchmarks.seed_dataset(
+            DatasetSize(
+                users=30, posts=40, comments=40, reactions=60, followings=5
+            )
+        )
+
+        results = benchmarks.run_scenarios(data, repeat=2, warmup=1)
+
+        self.assertEqual(list(results), list(benchmarks.SCENARIOS))
+        for name, result in results.items():
+            if name != "metrics":
+                self.assertGreater(result.queries, 0)
+            self.assertGreater(result.peak_kb, 0)
+            self.assertLessEqual(result.p50_ms, result.p95_ms)
+
+    def test_percentile_interpolates(self):
+        samples = [float(value) for value in range(1, 21)]
+
+        self.assertEqual(benchmarks.percentile(samples, 0.5), 10.5)
+        self.assertAlmostEqual(benchmarks.percentile(samples, 0.95), 19.05)
+
+    def test_regressions_compare_with_budgets(self):
+        baseline = {
+            "list": {"queries": 2, "p50_ms": 5, "p95_ms": 10, "peak_kb": 100},
+        }
+
+        within = {"list": Result(2, 5, 24, 120), "new": Result(9, 1, 1, 1)}
+        self.assertEqual(benchmarks.regressions(within, baseline, 1, 0.25), [])
+
+        failures = benchmarks.regressions(
+            {"list": Result(3, 5, 26, 130)}, baseline, 1, 0.25
+        )
+        self.assertEqual(len(failures), 3)
+        self.assertIn("3 queries, budget 2", failures[0])
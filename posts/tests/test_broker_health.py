@@ -0,0 +1,107 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from kombu.exceptions import OperationalError
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from social_media_api import broker
+from social_media_api.broker import BrokerHealthMonitor
+
+POST_CREATE_URL = reverse("posts:create_post-list")
+
+
+class FakeBroker:
+    def __init__(self):
+        self.up = True
+        self.pings = 0
+        self.now = 0.0
+
+    def ping(self) -> bool:
+        self.pings += 1
+        return self.up
+
+    def clock(self) -> float:
+        return self.now
+
+
+class BrokerHealthMonitorTests(SimpleTestCase):
+    def setUp(self):
+        self.broker = FakeBroker()
+        self.monitor = BrokerHealthMonitor(
+            ping=self.broker.ping,
+            interval=5,
+            failure_threshold=2,
+            max_cooldown=20,
+            clock=self.broker.clock,
+        )
+
+    def test_state_is_cached_between_probes(self):
+        self.assertTrue(self.monitor.check())
+        self.broker.now = 4
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(self.broker.pings, 1)
+
+    def test_breaker_opens_after_threshold_and_backs_off(self):
+        self.monitor.check()
+        self.broker.up = False
+
+        self.broker.now = 5
+        self.assertTrue(self.monitor.check())
+        self.broker.now = 10
+        self.assertFalse(self.monitor.check())
+
+        for now, cooldown in ((15, 10), (25, 20), (45, 20)):
+            self.broker.now = now
+            self.monitor.check()
+            self.assertEqual(self.monitor.cooldown, cooldown)
+        pings = self.broker.pings
+        self.broker.now = 64
+        self.monitor.check()
+        self.assertEqual(self.broker.pings, pings)
+
+        self.broker.up = True
+        self.broker.now = 65
+        self.assertTrue(self.monitor.check())
+        self.assertEqual(self.monitor.cooldown, 5)
+
+    def test_reported_failure_trips_breaker_at_once(self):
+        self.monitor.check()
+        self.monitor.record_failure()
+        self.assertFalse(self.monitor.available)
+        self.assertFalse(self.monitor.check())
+
+
+class CreatePostBrokerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+
+    @mock.patch.object(broker, "monitor")
+    def test_create_does_no_network_io_when_broker_is_down(self, monitor):
+        monitor.available = False
+        with mock.patch("redis.Redis.ping") as ping:
+            res = self.client.post(
+                POST_CREATE_URL, {"title": "title", "content": "content"}
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        ping.assert_not_called()
+        self.assertTrue(Post.objects.filter(title="title").exists())
+
+    @mock.patch("posts.views.queue_post", side_effect=OperationalError)
+    @mock.patch.object(broker, "monitor")
+    def test_send_failure_falls_back_to_direct_write(self, monitor, _):
+        monitor.available = True
+        res = self.client.post(
+            POST_CREATE_URL, {"title": "title", "content": "content"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Post.objects.filter(title="title").exists())
+        monitor.record_failure.assert_called_once()
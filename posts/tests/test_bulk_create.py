@@ -0,0 +1,82 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post, ScheduledPost, TimelineEntry
+from posts.views import CreatePostView
+from profiles.models import Profile
+
+BULK_URL = reverse("posts:create_post-bulk")
+PROFILE_URL = reverse("profiles:profiles_list-list")
+
+
+def items(count: int, **params) -> list[dict]:
+    return [
+        {"title": f"title {index}", "content": "content", **params}
+        for index in range(count)
+    ]
+
+
+@mock.patch.object(
+    CreatePostView, "check_connection_to_redis", return_value=True
+)
+class BulkCreatePostTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.user2 = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        Profile.objects.create(user=self.user1, username="test1")
+        profile2 = Profile.objects.create(user=self.user2, username="test2")
+        self.client.force_authenticate(self.user1)
+        self.client.get(PROFILE_URL + f"{profile2.id}/follow/")
+        self.client.force_authenticate(self.user2)
+
+    def test_due_posts_are_inserted_and_fanned_out(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(BULK_URL, items(30), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["created"]), 30)
+        self.assertEqual(res.data["scheduled"], 0)
+        self.assertEqual(Post.objects.filter(owner=self.user2).count(), 30)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.user1).count(), 30
+        )
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_query_count_does_not_grow_with_batch(self, _):
+        for count in (5, 120):
+            with self.assertNumQueries(6):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.post(BULK_URL, items(count), format="json")
+
+    def test_scheduled_posts_are_stored_for_publisher(self, _):
+        later = timezone.now() + timedelta(hours=1)
+        payload = items(3) + items(4, created_time=later.isoformat())
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["created"]), 3)
+        self.assertEqual(res.data["scheduled"], 4)
+        scheduled = ScheduledPost.objects.filter(owner=self.user2)
+        self.assertEqual(scheduled.count(), 4)
+        self.assertEqual(scheduled.first().publish_at, later)
+
+    def test_invalid_batches_are_rejected(self, _):
+        for payload in ([], items(5001), [{"title": "no content"}]):
+            res = self.client.post(BULK_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
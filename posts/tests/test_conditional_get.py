@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+POST_URL = reverse("posts:post_list-list")
+MY_POSTS_URL = reverse("posts:post_list-my-posts")
+
+
+class PostConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(
+            title="test_title", content="test_content", owner=self.user
+        )
+
+    def test_list_not_modified_without_queries(self):
+        res = self.client.get(POST_URL, {"title": "test"})
+        etag = res.headers["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                POST_URL, {"title": "test"}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.headers["ETag"], etag)
+
+        other = self.client.get(MY_POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_after_write(self):
+        etag = self.client.get(POST_URL).headers["ETag"]
+        self.client.post(POST_URL + f"{self.post.id}/like/")
+
+        res = self.client.get(POST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.headers["ETag"], etag)
+        self.assertEqual(res.data["results"][0]["likes_count"], 1)
+
+    def test_retrieve_not_modified_until_post_changes(self):
+        url = POST_URL + f"{self.post.id}/"
+        res = self.client.get(url)
+        etag = res.headers["ETag"]
+        self.assertIn("Last-Modified", res.headers)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(
+            POST_URL + f"{self.post.id}/add-comment/",
+            data={"content": "comment"},
+        )
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["commentaries"]["count"], 1)
@@ -0,0 +1,182 @@
+from collections import defaultdict
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts import counter_buffer
+from posts.models import AppliedBatch, Post
+from social_media_api import broker
+
+POST_URL = reverse("posts:post_list-list")
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = defaultdict(dict)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def hincrby(self, key, field, delta):
+        value = int(self.hashes[key].get(field.encode(), 0)) + delta
+        self.hashes[key][field.encode()] = str(value).encode()
+        return value
+
+    def hset(self, key, field, value):
+        self.hashes[key][field.encode()] = str(value).encode()
+
+    def hmget(self, key, fields):
+        return [self.hashes[key].get(field.encode()) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.hashes[key])
+
+    def exists(self, key):
+        return int(bool(self.hashes.get(key)))
+
+    def rename(self, key, new_key):
+        self.hashes[new_key] = self.hashes.pop(key)
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def lock(self, key, timeout=None):
+        return mock.MagicMock(acquire=mock.MagicMock(return_value=True))
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        return lambda *args: self.calls.append((method, args))
+
+    def execute(self):
+        return [method(*args) for method, args in self.calls]
+
+
+@override_settings(COUNTER_WRITE_MODE="buffered", COUNTER_FLUSH_INTERVAL=60.0)
+class CounterBufferTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(broker, "monitor", available=False)
+        self.monitor = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(counter_buffer.local_buffer.flush)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.posts = [
+            Post.objects.create(title=f"title {index}", owner=self.user)
+            for index in range(3)
+        ]
+
+    def react(self, post: Post, reaction: str) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(POST_URL + f"{post.id}/{reaction}/")
+
+    def test_reads_include_pending_deltas(self):
+        self.react(self.posts[0], "like")
+        self.react(self.posts[1], "like")
+        self.react(self.posts[1], "dislike")
+
+        self.assertEqual(
+            list(Post.objects.values_list("likes_count", flat=True)),
+            [0, 0, 0],
+        )
+        res = self.client.get(POST_URL)
+        counts = {
+            post["id"]: (post["likes_count"], post["dislikes_count"])
+            for post in res.data["results"]
+        }
+        self.assertEqual(counts[self.posts[0].id], (1, 0))
+        self.assertEqual(counts[self.posts[1].id], (0, 1))
+
+        res = self.client.get(POST_URL + f"{self.posts[0].id}/")
+        self.assertEqual(res.data["likes"]["count"], 1)
+
+    def test_detail_etag_changes_with_pending_deltas(self):
+        url = POST_URL + f"{self.posts[0].id}/"
+        etag = self.client.get(url).headers["ETag"]
+
+        self.react(self.posts[0], "like")
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["likes"]["count"], 1)
+
+    def test_flush_writes_all_posts_in_one_update(self):
+        for post in self.posts:
+            self.react(post, "like")
+        self.react(self.posts[2], "dislike")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(counter_buffer.flush(), 3)
+
+        self.assertEqual(
+            list(
+                Post.objects.order_by("id").values_list(
+                    "likes_count", "dislikes_count"
+                )
+            ),
+            [(1, 0), (1, 0), (0, 1)],
+        )
+        self.assertEqual(counter_buffer.pending_deltas([self.posts[0].id]), {})
+
+    def test_redis_buffer_round_trip(self):
+        self.monitor.available = True
+        fake = FakeRedis()
+        with mock.patch.object(counter_buffer, "get_redis", return_value=fake):
+            self.react(self.posts[0], "like")
+            self.react(self.posts[1], "dislike")
+            self.assertEqual(
+                counter_buffer.pending_deltas([self.posts[0].id]),
+                {self.posts[0].id: {"likes_count": 1}},
+            )
+
+            self.assertEqual(counter_buffer.flush(), 2)
+
+            self.assertFalse(fake.exists(counter_buffer.PENDING_KEY))
+            self.assertFalse(fake.exists(counter_buffer.FLUSHING_KEY))
+        self.assertEqual(
+            list(
+                Post.objects.order_by("id").values_list(
+                    "likes_count", "dislikes_count"
+                )[:2]
+            ),
+            [(1, 0), (0, 1)],
+        )
+
+    def test_redis_flush_that_died_after_commit_is_not_applied_twice(self):
+        self.monitor.available = True
+        fake = FakeRedis()
+        with mock.patch.object(counter_buffer, "get_redis", return_value=fake):
+            self.react(self.posts[0], "like")
+            self.assertEqual(counter_buffer.flush(), 1)
+            # A flush committed this like and died before deleting it
+            flushing = counter_buffer.FLUSHING_KEY
+            fake.hincrby(flushing, f"{self.posts[0].id}:likes_count", 1)
+            fake.hset(flushing, counter_buffer.FLUSH_ID_FIELD, "crashed")
+            AppliedBatch.record("post-counters:crashed")
+            self.react(self.posts[0], "dislike")
+
+            self.assertEqual(
+                counter_buffer.pending_deltas([self.posts[0].id]),
+                {self.posts[0].id: {"likes_count": -1, "dislikes_count": 1}},
+            )
+            self.assertEqual(counter_buffer.flush(), 0)
+            self.assertFalse(fake.exists(counter_buffer.FLUSHING_KEY))
+            self.assertEqual(counter_buffer.flush(), 1)
+
+        self.posts[0].refresh_from_db()
+        self.assertEqual(
+            (self.posts[0].likes_count, self.posts[0].dislikes_count), (0, 1)
+        )
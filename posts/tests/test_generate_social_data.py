@@ -0,0 +1,71 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from comments.models import Commentary
+from likes.models import Reaction
+from posts.counters import rebuild_post_counters
+from posts.models import Post
+from profiles.models import Profile
+
+
+class GenerateSocialDataTests(TestCase):
+    def generate(self, seed: int = 7) -> list[tuple]:
+        call_command(
+            "generate_social_data",
+            "--users=60",
+            "--posts=300",
+            "--comments=400",
+            "--reactions=700",
+            "--follows=6",
+            f"--seed={seed}",
+            "--batch-size=50",
+            stdout=io.StringIO(),
+        )
+        first_user = get_user_model().objects.order_by("id")[0].id
+        return [
+            (title, created_time, owner_id - first_user)
+            for title, created_time, owner_id in Post.objects.order_by(
+                "id"
+            ).values_list("title", "created_time", "owner_id")
+        ]
+
+    def test_generates_consistent_data(self):
+        self.generate()
+
+        self.assertEqual(get_user_model().objects.count(), 60)
+        self.assertEqual(Profile.objects.count(), 60)
+        self.assertEqual(Post.objects.count(), 300)
+        self.assertEqual(Commentary.objects.count(), 400)
+        self.assertLessEqual(Reaction.objects.count(), 700)
+        self.assertEqual(rebuild_post_counters(), 0)
+        self.assertEqual(
+            Profile.following.through.objects.count(),
+            Profile.followers.through.objects.count(),
+        )
+        new = Post.objects.create(
+            title="new", owner_id=Post.objects.first().owner_id
+        )
+        self.assertEqual(new.id, 301)
+
+    def test_follow_graph_has_celebrities(self):
+        self.generate()
+
+        followers = sorted(
+            Profile.objects.annotate(total=Count("followers")).values_list(
+                "total", flat=True
+            ),
+            reverse=True,
+        )
+        self.assertGreater(followers[0], 5 * followers[len(followers) // 2])
+
+    def test_same_seed_gives_same_data(self):
+        first = self.generate()
+        get_user_model().objects.all().delete()
+
+        self.assertEqual(self.generate(), first)
+        get_user_model().objects.all().delete()
+        self.assertNotEqual(self.generate(seed=8), first)
@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from likes.models import Reaction
+from posts.management.commands.import_social_data import iter_fixture
+from posts.models import Post
+from profiles.models import Profile
+
+HASHED = "pbkdf2_sha256$600000$salt$hash="
+
+
+def user(pk: int, password: str) -> dict:
+    return {
+        "model": "users.user",
+        "pk": pk,
+        "fields": {
+            "email": f"user{pk}@test.com",
+            "password": password,
+            "groups": [],
+        },
+    }
+
+
+class ImportSocialDataTests(TestCase):
+    def import_fixture(self, objects: list, *args: str) -> str:
+        descriptor, path = tempfile.mkstemp(suffix=".json")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(descriptor, "w") as fixture:
+            json.dump(objects, fixture, indent=2)
+        out = io.StringIO()
+        call_command("import_social_data", path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_iter_fixture_across_chunk_boundaries(self):
+        objects = [
+            {"pk": index, "text": "x, ] {" * index} for index in range(20)
+        ]
+        stream = io.StringIO(json.dumps(objects, indent=1))
+
+        self.assertEqual(list(iter_fixture(stream, read_size=7)), objects)
+        self.assertEqual(list(iter_fixture(io.StringIO(" [ ] "))), [])
+
+    def test_iter_fixture_rejects_broken_input(self):
+        for text in ('{"pk": 1}', '[{"pk": 1}', '[{"pk": 1},]', "[1]"):
+            with self.subTest(text=text):
+                with self.assertRaises(CommandError):
+                    list(iter_fixture(io.StringIO(text), read_size=4))
+
+    def test_import_in_batches(self):
+        objects = [user(1, HASHED), user(2, "plain-password")]
+        objects += [
+            {
+                "model": "profiles.profile",
+                "pk": pk,
+                "fields": {
+                    "user": pk,
+                    "username": f"user{pk}",
+                    "followers": [3 - pk],
+                    "following": [3 - pk],
+                },
+            }
+            for pk in (1, 2)
+        ]
+        objects += [
+            {
+                "model": "posts.post",
+                "pk": pk,
+                "fields": {
+                    "title": f"post {pk}",
+                    "content": "",
+                    "owner": 1,
+                    "created_time": "2023-05-01T10:00:00Z",
+                },
+            }
+            for pk in range(1, 8)
+        ]
+        objects.append(
+            {
+                "model": "likes.reaction",
+                "pk": 1,
+                "fields": {"post": 3, "user": 2, "value": 1},
+            }
+        )
+
+        out = self.import_fixture(objects, "--batch-size", "3")
+
+        self.assertIn("Imported 16 rows", out)
+        users = get_user_model().objects.order_by("id")
+        self.assertEqual(users[0].password, HASHED)
+        self.assertTrue(users[1].check_password("plain-password"))
+        profile = Profile.objects.get(pk=1)
+        self.assertEqual(list(profile.followers.all()), [users[1]])
+        self.assertEqual(list(profile.following.all()), [users[1]])
+        self.assertEqual(Post.objects.count(), 7)
+        self.assertEqual(Post.objects.get(pk=3).likes_count, 1)
+        self.assertEqual(Reaction.objects.get().user, users[1])
+        # sequences continue after the imported primary keys
+        self.assertEqual(
+            Post.objects.create(title="new", owner=users[0]).pk, 8
+        )
+
+    def test_import_bundled_fixture(self):
+        path = os.path.join(settings.BASE_DIR, "social_media_data.json")
+        out = io.StringIO()
+        call_command("import_social_data", path, stdout=out)
+
+        self.assertIn("Imported 6 rows", out.getvalue())
+        self.assertTrue(
+            get_user_model()
+            .objects.get(email="admin@social.com")
+            .password.startswith("pbkdf2_sha256$")
+        )
+        self.assertEqual(Profile.objects.count(), 2)
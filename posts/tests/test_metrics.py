@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from posts.tasks import publish_scheduled_posts
+from social_media_api.metrics import Registry, registry
+
+POST_URL = reverse("posts:post_list-list")
+METRICS_URL = reverse("metrics")
+
+
+def sample(name: str, **labels) -> float:
+    key = (name, tuple(sorted(labels.items())))
+    return registry.samples().get(key, 0.0)
+
+
+@override_settings(METRICS_TOKEN="scraper-token")
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        Post.objects.create(title="title", content="text", owner=self.user)
+
+    def scrape(self) -> str:
+        res = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer scraper-token"
+        )
+        self.assertEqual(res.status_code, 200)
+        return res.content.decode()
+
+    def test_views_and_cache_lookups_are_recorded(self):
+        view = "posts:post_list-list"
+        requests = sample(
+            "http_requests_total", method="GET", status="200", view=view
+        )
+        misses = sample(
+            "response_cache_requests_total", outcome="misses", resource="posts"
+        )
+
+        self.client.get(POST_URL)
+        self.client.get(POST_URL)
+
+        self.assertEqual(
+            sample(
+                "http_requests_total", method="GET", status="200", view=view
+            ),
+            requests + 2,
+        )
+        self.assertEqual(
+            sample(
+                "response_cache_requests_total",
+                outcome="misses",
+                resource="posts",
+            ),
+            misses + 1,
+        )
+        body = self.scrape()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'http_request_queries_bucket{view="' + view + '",le="+Inf"}',
+            body,
+        )
+        self.assertIn(
+            'response_cache_requests_total{outcome="hits",resource="posts"}',
+            body,
+        )
+
+    def test_celery_tasks_are_recorded(self):
+        task = publish_scheduled_posts.name
+        runs = sample("celery_tasks_total", state="SUCCESS", task=task)
+
+        publish_scheduled_posts.apply()
+
+        self.assertEqual(
+            sample("celery_tasks_total", state="SUCCESS", task=task), runs + 1
+        )
+        self.assertGreater(
+            sample("celery_task_duration_seconds_count", task=task), 0
+        )
+
+    def test_scrape_sums_every_process_in_metrics_dir(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "1.json"), "w") as file:
+                json.dump([["celery_tasks_total", [["state", "X"]], 3]], file)
+            with override_settings(METRICS_DIR=directory):
+                publish_scheduled_posts.apply()
+                body = self.scrape()
+
+                self.assertIn('celery_tasks_total{state="X"} 3\n', body)
+                self.assertIn(f"{os.getpid()}.json", os.listdir(directory))
+
+    def test_finished_threads_fold_into_retired_shard(self):
+        local = Registry()
+        key = ("jobs_total", ())
+        for _ in range(3):
+            thread = threading.Thread(target=local.add, args=(key, 1))
+            thread.start()
+            thread.join()
+        local.add(key, 1)
+
+        self.assertEqual(local.samples(), {key: 4.0})
+        self.assertEqual(list(local.shards), [threading.current_thread()])
+
+    def test_scrape_merges_files_of_exited_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for pid in (1, 2):
+                path = os.path.join(directory, f"{pid}.json")
+                with open(path, "w") as file:
+                    json.dump(
+                        [["celery_tasks_total", [["state", "X"]], pid]], file
+                    )
+                os.utime(path, (0, 0))
+            with override_settings(METRICS_DIR=directory), mock.patch(
+                "os.kill", side_effect=ProcessLookupError
+            ):
+                for _ in range(2):
+                    body = self.scrape()
+                    self.assertIn('celery_tasks_total{state="X"} 3\n', body)
+
+            self.assertEqual(
+                sorted(os.listdir(directory)),
+                [f"{os.getpid()}.json", "retired.json", "retired.lock"],
+            )
+
+    def test_scrape_requires_staff_or_token(self):
+        client = APIClient()
+        self.assertEqual(client.get(METRICS_URL).status_code, 403)
+        res = client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(res.status_code, 403)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        client.force_login(self.user)
+        self.assertEqual(client.get(METRICS_URL).status_code, 200)
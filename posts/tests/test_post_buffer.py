@@ -0,0 +1,130 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from posts import buffer
+from posts.models import AppliedBatch, Post
+from posts.tasks import queue_post
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+
+        return queue
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.values = {}
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        return len(self.lists[key])
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+    def ltrim(self, key, start, end):
+        items = self.lists.get(key, [])
+        self.lists[key] = items[start:] if end == -1 else items[start:end + 1]
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, key, timeout=None):
+        return mock.MagicMock(acquire=mock.MagicMock(return_value=True))
+
+
+@override_settings(POST_CREATE_MODE="batch", POST_CREATE_BATCH_SIZE=3)
+class PostBufferTests(TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch.object(
+            buffer, "get_redis", return_value=self.redis
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+
+    @mock.patch("posts.tasks.drain_post_buffer.delay")
+    def test_only_first_buffered_post_sends_a_message(self, delay):
+        for index in range(4):
+            queue_post(f"title {index}", "content", self.user.id)
+
+        self.assertEqual(len(self.redis.lists[buffer.BUFFER_KEY]), 4)
+        delay.assert_called_once()
+        self.assertFalse(Post.objects.exists())
+
+    @mock.patch("posts.tasks.drain_post_buffer.delay")
+    def test_drain_inserts_batches_and_skips_missing_owners(self, _):
+        for index in range(7):
+            queue_post(f"title {index}", "content", self.user.id)
+        buffer.push(self.user.id + 100, "orphan", "content")
+
+        # per batch: applied batch key and owners IN query, insert, three
+        # savepoints and their releases; the prune, then per batch the
+        # fan-out: posts, follower lookup
+        with self.assertNumQueries(34):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(buffer.drain(), 8)
+
+        self.assertEqual(
+            list(
+                Post.objects.order_by("id").values_list("title", flat=True)
+            ),
+            [f"title {index}" for index in range(7)],
+        )
+        self.assertEqual(self.redis.lists[buffer.BUFFER_KEY], [])
+        self.assertNotIn(buffer.PROCESSING_KEY, self.redis.values)
+
+    def test_drain_retries_a_leftover_batch_once(self):
+        buffer.push(self.user.id, "crashed", "content")
+        buffer.push(self.user.id, "queued", "content")
+        batch = buffer.take_batch(self.redis, 1)
+        # Its drainer committed the batch and died before the cleanup
+        AppliedBatch.record(f"post-buffer:{batch['id']}")
+        Post.objects.create(owner=self.user, title="crashed", content="x")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(buffer.drain(), 2)
+
+        self.assertEqual(
+            sorted(Post.objects.values_list("title", flat=True)),
+            ["crashed", "queued"],
+        )
+        self.assertNotIn(buffer.PROCESSING_KEY, self.redis.values)
+
+    def test_benchmark_command_reports_both_modes(self):
+        out = StringIO()
+        call_command(
+            "benchmark_post_creation", tasks=10, batch_size=4, stdout=out
+        )
+
+        self.assertIn("single: 10 posts", out.getvalue())
+        self.assertIn("batch: 10 posts", out.getvalue())
+        self.assertFalse(Post.objects.exists())
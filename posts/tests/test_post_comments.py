@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from comments.models import Commentary
+from posts.models import Post
+from profiles.models import Profile
+
+POST_URL = reverse("posts:post_list-list")
+
+
+class PostCommentThreadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        Profile.objects.create(user=self.user, username="author")
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(title="thread", owner=self.user)
+        other = Post.objects.create(title="other", owner=self.user)
+        Commentary.objects.bulk_create(
+            Commentary(post=post, user=self.user, content=f"comment {index}")
+            for index in range(25)
+            for post in (self.post, other)
+        )
+        self.url = POST_URL + f"{self.post.id}/comments/"
+        self.ids = list(
+            Commentary.objects.filter(post=self.post)
+            .order_by("created_time", "id")
+            .values_list("id", flat=True)
+        )
+
+    def read_thread(self, params: dict) -> list[int]:
+        ids = []
+        res = self.client.get(self.url, params)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids += [comment["id"] for comment in res.data["results"]]
+            if not res.data["next"]:
+                return ids
+            res = self.client.get(res.data["next"])
+
+    def test_thread_oldest_and_newest_first(self):
+        self.assertEqual(self.read_thread({"page_size": 10}), self.ids)
+        self.assertEqual(
+            self.read_thread({"page_size": 10, "order": "newest"}),
+            self.ids[::-1],
+        )
+
+    def test_comments_embed_author_username(self):
+        # post exists check and one page joined with author profiles
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, {"order": "newest"})
+        self.assertEqual(res.data["results"][0]["username"], "author")
+
+    def test_invalid_order_is_rejected(self):
+        res = self.client.get(self.url, {"order": "random"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deep_page_seeks_on_thread_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN output is SQLite specific")
+        res = self.client.get(self.url, {"page_size": 20})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(res.data["next"])
+        sql = queries.captured_queries[-1]["sql"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = "\n".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("commentary_post_time_idx (post_id=?", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_comment_list_pages_on_time_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN output is SQLite specific")
+        url = reverse("comments:comment_list-list")
+        res = self.client.get(url, {"page_size": 20, "order": "newest"})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(res.data["next"])
+        sql = queries.captured_queries[0]["sql"]
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = "\n".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("commentary_time_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
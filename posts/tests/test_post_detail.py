@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from comments.models import Commentary
+from posts.models import Post
+from posts.serializers import NESTED_LIMIT
+from profiles.models import Profile
+
+POST_URL = reverse("posts:post_list-list")
+
+
+class PostDetailTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = get_user_model().objects.create_user(
+            "owner@test.com",
+            "testpass",
+        )
+        self.post = Post.objects.create(
+            title="viral", content="content", owner=self.owner
+        )
+        for index in range(NESTED_LIMIT + 5):
+            user = get_user_model().objects.create_user(
+                f"fan{index}@test.com",
+                "testpass",
+            )
+            Profile.objects.create(user=user, username=f"fan{index}")
+            self.client.force_authenticate(user)
+            self.client.post(POST_URL + f"{self.post.id}/like/")
+            self.client.post(
+                POST_URL + f"{self.post.id}/add-comment/",
+                data={"content": f"comment {index}"},
+            )
+        self.client.force_authenticate(self.owner)
+
+    def test_retrieve_caps_nested_collections(self):
+        # updated_at validator, post, commentaries, likes, dislikes
+        with self.assertNumQueries(5):
+            res = self.client.get(POST_URL + f"{self.post.id}/")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        likes = res.data["likes"]
+        self.assertEqual(likes["count"], NESTED_LIMIT + 5)
+        self.assertEqual(len(likes["results"]), NESTED_LIMIT)
+        self.assertEqual(likes["results"][0]["user"]["username"], "fan0")
+        self.assertEqual(res.data["dislikes"]["count"], 0)
+        self.assertIsNone(res.data["dislikes"]["next"])
+        self.assertEqual(len(res.data["commentaries"]["results"]), 10)
+
+    def test_nested_next_links_continue_on_sub_endpoints(self):
+        res = self.client.get(POST_URL + f"{self.post.id}/")
+
+        likes = self.client.get(res.data["likes"]["next"])
+        self.assertEqual(
+            [like["user"]["username"] for like in likes.data["results"]],
+            [f"fan{index}" for index in range(NESTED_LIMIT, NESTED_LIMIT + 5)],
+        )
+        self.assertIsNone(likes.data["next"])
+
+        comments = self.client.get(res.data["commentaries"]["next"])
+        self.assertEqual(
+            [comment["id"] for comment in comments.data["results"]],
+            list(
+                Commentary.objects.order_by("created_time", "id")
+                .values_list("id", flat=True)[NESTED_LIMIT:]
+            ),
+        )
+
+    def test_sub_endpoint_of_missing_post(self):
+        res = self.client.get(POST_URL + "0/likes/")
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
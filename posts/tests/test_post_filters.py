@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+POST_URL = reverse("posts:post_list-list")
+MY_POSTS_URL = reverse("posts:post_list-my-posts")
+
+
+def sample_post(**params):
+    defaults = {
+        "title": "test_title",
+        "content": "test_content",
+        "owner": None,
+    }
+    defaults.update(params)
+
+    return Post.objects.create(**defaults)
+
+
+class PostCreatedTimeFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.user2 = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user1)
+        midnight = timezone.make_aware(datetime(2023, 5, 2))
+        self.day_before = sample_post(
+            owner=self.user1, created_time=midnight - timedelta(seconds=1)
+        )
+        self.at_midnight = sample_post(
+            owner=self.user1, created_time=midnight
+        )
+        self.next_day = sample_post(
+            owner=self.user2, created_time=midnight + timedelta(days=1)
+        )
+        for _ in range(20):
+            sample_post(owner=self.user2)
+
+    def get_ids(self, url: str, params: dict) -> list[int]:
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in res.data["results"]]
+
+    def explain(self, url: str, params: dict) -> str:
+        """Return the query plan of the query listing the posts"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url, params)
+        sql = next(
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "posts_post"' in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def test_filter_by_created_time_day(self):
+        self.assertEqual(
+            self.get_ids(POST_URL, {"created_time": "2023-05-02"}),
+            [self.at_midnight.id],
+        )
+
+    def test_filter_by_since_and_until(self):
+        self.assertEqual(
+            self.get_ids(
+                POST_URL, {"since": "2023-05-01", "until": "2023-05-02"}
+            ),
+            [self.day_before.id],
+        )
+        self.assertEqual(
+            self.get_ids(MY_POSTS_URL, {"since": "2023-05-02"}),
+            [self.at_midnight.id],
+        )
+
+    def test_invalid_date_is_rejected(self):
+        res = self.client.get(POST_URL, {"since": "yesterday"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_out_of_range_date_is_rejected(self):
+        for params in (
+            {"created_time": "2023-02-30"},
+            {"created_time": "9999-12-31"},
+            {"since": "2023-02-30"},
+            {"until": "2023-13-01T00:00"},
+        ):
+            with self.subTest(params=params):
+                res = self.client.get(POST_URL, params)
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_by_date_range_uses_index_range_scan(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN output is SQLite specific")
+        plan = self.explain(
+            POST_URL, {"since": "2023-05-01", "until": "2023-05-03"}
+        )
+        self.assertIn("USING INDEX post_recent_idx (created_time", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_my_posts_uses_owner_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN output is SQLite specific")
+        plan = self.explain(MY_POSTS_URL, {})
+        self.assertIn("USING INDEX post_owner_recent_idx (owner_id=?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -1,9 +1,15 @@
+import json
+from base64 import b64encode
+from io import StringIO
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 from django.utils import timezone
+from comments.models import Commentary
 from posts.models import Post
 from posts.serializers import PostSerializer
 from profiles.models import Profile
@@ -68,10 +74,46 @@ class AuthenticatePostApiTests(TestCase):
 
         res = self.client.get(POST_URL)
 
-        profiles = Post.objects.order_by("id")
+        profiles = Post.objects.order_by("-created_time", "-id")
         serializer = PostSerializer(profiles, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_list_post_cursor_pagination(self):
+        posts = [sample_post(owner=self.user1) for _ in range(5)]
+        expected = [post.id for post in reversed(posts)]
+
+        res = self.client.get(POST_URL, {"page_size": 2})
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], expected[:2]
+        )
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], expected[2:4]
+        )
+
+        res = self.client.get(res.data["previous"])
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], expected[:2]
+        )
+
+    def test_list_post_invalid_cursor(self):
+        res = self.client.get(POST_URL, {"cursor": "invalid"})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_post_cursor_with_invalid_values(self):
+        for position in (
+            ["x", "y"],
+            [None, None],
+            [{"a": 1}, 1],
+            ["2023-01-01T00:00:00", "abc"],
+        ):
+            cursor = b64encode(json.dumps({"p": position}).encode()).decode()
+            with self.subTest(position=position):
+                res = self.client.get(POST_URL, {"cursor": cursor})
+                self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_create_post(self):
         payload = {
@@ -93,8 +135,8 @@ class AuthenticatePostApiTests(TestCase):
         res = self.client.get(MY_POSTS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data["results"])
+        self.assertNotIn(serializer2.data, res.data["results"])
 
     def test_following_user_posts(self):
         sample_profile(user=self.user1)
@@ -107,19 +149,27 @@ class AuthenticatePostApiTests(TestCase):
         res = self.client.get(FOLLOWERS_POSTS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer1.data, res.data)
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer1.data, res.data["results"])
 
     def test_add_comment_in_post(self):
         post2 = sample_post(owner=self.user2)
         comment_data = {"content": "Test Comment"}
-        serializer2 = PostSerializer(post2)
         res = self.client.post(
             POST_URL + f"{post2.id}/add-comment/", data=comment_data
         )
+        post2.refresh_from_db()
+        serializer2 = PostSerializer(post2)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(serializer2.data["comments"], 1)
 
+    def test_add_comment_to_missing_post(self):
+        res = self.client.post(
+            POST_URL + "999999/add-comment/", data={"content": "Test"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Commentary.objects.exists())
+
     def test_like_post(self):
         post1 = sample_post(owner=self.user1)
         serializer2 = PostSerializer(post1)
@@ -128,7 +178,16 @@ class AuthenticatePostApiTests(TestCase):
 
         post1.refresh_from_db()
         serializer2 = PostSerializer(post1)
-        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "liked": True,
+                "disliked": False,
+                "likes_count": 1,
+                "dislikes_count": 0,
+            },
+        )
         self.assertEqual(serializer2.data["likes_count"], 1)
 
     def test_dislike_post(self):
@@ -139,7 +198,9 @@ class AuthenticatePostApiTests(TestCase):
 
         post1.refresh_from_db()
         serializer2 = PostSerializer(post1)
-        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.data["disliked"])
+        self.assertEqual(res.data["dislikes_count"], 1)
         self.assertEqual(serializer2.data["dislikes_count"], 1)
 
     def test_delete_like_if_add_dislike(self):
@@ -156,3 +217,26 @@ class AuthenticatePostApiTests(TestCase):
         serializer2 = PostSerializer(post1)
         self.assertEqual(serializer2.data["likes_count"], 0)
         self.assertEqual(serializer2.data["dislikes_count"], 1)
+
+    @override_settings(ACTION_REDIRECTS=True)
+    def test_like_post_redirects_when_enabled(self):
+        post1 = sample_post(owner=self.user1)
+        res = self.client.post(POST_URL + f"{post1.id}/like/")
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res.url, POST_URL)
+
+    def test_rebuild_post_counters(self):
+        post1 = sample_post(owner=self.user1)
+        self.client.post(POST_URL + f"{post1.id}/like/")
+        self.client.post(
+            POST_URL + f"{post1.id}/add-comment/", data={"content": "Test"}
+        )
+        Post.objects.update(likes_count=5, comments_count=0)
+
+        call_command("rebuild_post_counters", stdout=StringIO())
+
+        post1.refresh_from_db()
+        self.assertEqual(post1.likes_count, 1)
+        self.assertEqual(post1.dislikes_count, 0)
+        self.assertEqual(post1.comments_count, 1)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from profiles.models import Profile
+
+POST_URL = reverse("posts:post_list-list")
+MY_POSTS_URL = reverse("posts:post_list-my-posts")
+FOLLOWERS_POSTS_URL = reverse("posts:post_list-following-users-posts")
+PROFILE_URL = reverse("profiles:profiles_list-list")
+
+
+class PostListQueryCountTests(TestCase):
+    """Listing posts must not issue queries per serialized post"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.user2 = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        Profile.objects.create(user=self.user1, username="test1")
+        profile2 = Profile.objects.create(user=self.user2, username="test2")
+        self.client.force_authenticate(self.user1)
+        self.client.get(PROFILE_URL + f"{profile2.id}/follow/")
+        with self.captureOnCommitCallbacks(execute=True):
+            for owner in (self.user1, self.user2):
+                for index in range(100):
+                    post = Post.objects.create(
+                        title=f"title {index}", content="content", owner=owner
+                    )
+                    self.client.post(POST_URL + f"{post.id}/like/")
+                    self.client.post(
+                        POST_URL + f"{post.id}/add-comment/",
+                        data={"content": "comment"},
+                    )
+
+    def count_queries(self, url: str, page_size: int) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, {"page_size": page_size})
+        self.assertEqual(len(res.data["results"]), page_size)
+        return len(queries)
+
+    def test_list_100_posts(self):
+        # the page and the viewer's reactions to it
+        with self.assertNumQueries(2):
+            res = self.client.get(POST_URL, {"page_size": 100})
+        self.assertEqual(len(res.data["results"]), 100)
+        self.assertTrue(
+            all(post["likes_count"] == 1 for post in res.data["results"])
+        )
+        self.assertTrue(
+            all(post["comments"] == 1 for post in res.data["results"])
+        )
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for url in (POST_URL, MY_POSTS_URL, FOLLOWERS_POSTS_URL):
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.count_queries(url, 10),
+                    self.count_queries(url, 50),
+                )
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from likes.models import Reaction
+from posts.models import Post
+
+POST_URL = reverse("posts:post_list-list")
+
+
+class ReactionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(
+            title="test_title", content="test_content", owner=self.user
+        )
+        self.url = POST_URL + f"{self.post.id}/"
+
+    def assert_counters(self, likes: int, dislikes: int) -> None:
+        self.post.refresh_from_db()
+        self.assertEqual(
+            (self.post.likes_count, self.post.dislikes_count),
+            (likes, dislikes),
+        )
+
+    def test_like_is_one_insert_and_one_counter_update(self):
+        # savepoint, insert, counter update, release, counters in response
+        with self.assertNumQueries(5):
+            self.client.post(self.url + "like/")
+
+        self.assert_counters(1, 0)
+        self.assertEqual(
+            Reaction.objects.get().value, Reaction.Value.LIKE
+        )
+
+    def test_repeated_like_changes_nothing(self):
+        self.client.post(self.url + "like/")
+        self.client.post(self.url + "like/")
+
+        self.assertEqual(Reaction.objects.count(), 1)
+        self.assert_counters(1, 0)
+
+    def test_dislike_flips_like_in_place(self):
+        self.client.post(self.url + "like/")
+        reaction = Reaction.objects.get()
+
+        self.client.post(self.url + "dislike/")
+
+        reaction.refresh_from_db()
+        self.assertEqual(reaction.value, Reaction.Value.DISLIKE)
+        self.assert_counters(0, 1)
+
+    def test_clear_reaction(self):
+        self.client.post(self.url + "dislike/")
+
+        self.client.delete(self.url + "clear-reaction/")
+        res = self.client.delete(self.url + "clear-reaction/")
+
+        self.assertEqual(
+            res.data,
+            {
+                "liked": False,
+                "disliked": False,
+                "likes_count": 0,
+                "dislikes_count": 0,
+            },
+        )
+
+        self.assertFalse(Reaction.objects.exists())
+        self.assert_counters(0, 0)
+
+    def test_reacting_to_missing_post_is_not_found(self):
+        res = self.client.post(POST_URL + "0/like/")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Reaction.objects.exists())
+
+    def test_list_shows_my_reaction_with_one_query_per_page(self):
+        other = Post.objects.create(title="other", owner=self.user)
+        Post.objects.create(title="third", owner=self.user)
+        self.client.post(self.url + "like/")
+        self.client.post(POST_URL + f"{other.id}/dislike/")
+
+        res = self.client.get(POST_URL)
+        reactions = {
+            post["id"]: post["my_reaction"] for post in res.data["results"]
+        }
+        self.assertEqual(reactions[self.post.id], "like")
+        self.assertEqual(reactions[other.id], "dislike")
+        self.assertEqual(list(reactions.values()).count(None), 1)
+
+        with self.assertNumQueries(2):  # page, reactions of the page
+            self.client.get(POST_URL, {"title": "t"})
+        for index in range(10):
+            Post.objects.create(title=f"t{index}", owner=self.user)
+        with self.assertNumQueries(2):
+            self.client.get(POST_URL, {"title": "t"})
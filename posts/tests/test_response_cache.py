@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from profiles.models import Profile
+from social_media_api.metrics import registry
+
+POST_URL = reverse("posts:post_list-list")
+PROFILE_URL = reverse("profiles:profiles_list-list")
+
+
+def cache_requests(outcome: str) -> float:
+    key = (
+        "response_cache_requests_total",
+        (("outcome", outcome), ("resource", "posts")),
+    )
+    return registry.samples().get(key, 0.0)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(
+            title="test_title", content="test_content", owner=self.user
+        )
+
+    def test_escaped_values_get_their_own_page(self):
+        res = self.client.get(POST_URL + "?content=a&title=b")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+
+        res = self.client.get(POST_URL + "?content=a%26title%3Db")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+
+    def test_equivalent_queries_share_a_cached_page(self):
+        hits, misses = cache_requests("hits"), cache_requests("misses")
+        res = self.client.get(POST_URL + "?title=test&created_time=")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            res = self.client.get(POST_URL + "?created_time=&title=test")
+        self.assertEqual(res.headers["X-Cache"], "HIT")
+        self.assertEqual(res.data["results"][0]["id"], self.post.id)
+        self.assertEqual(cache_requests("hits"), hits + 1)
+        self.assertEqual(cache_requests("misses"), misses + 1)
+
+    def test_writes_invalidate_cached_pages(self):
+        self.client.get(POST_URL)
+        self.client.post(POST_URL + f"{self.post.id}/like/")
+
+        res = self.client.get(POST_URL)
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["likes_count"], 1)
+
+        Post.objects.create(title="other", content="x", owner=self.user)
+        res = self.client.get(POST_URL)
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_post_pages_are_cached_per_user(self):
+        self.client.post(POST_URL + f"{self.post.id}/like/")
+        self.client.get(POST_URL)
+
+        other = get_user_model().objects.create_user(
+            "test2@test.com", "testpass"
+        )
+        self.client.force_authenticate(other)
+        res = self.client.get(POST_URL)
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertIsNone(res.data["results"][0]["my_reaction"])
+
+    def test_profile_pages_follow_profile_writes(self):
+        profile = Profile.objects.create(user=self.user, username="test1")
+        self.client.get(PROFILE_URL, {"username": "test"})
+
+        res = self.client.get(PROFILE_URL, {"username": "test"})
+        self.assertEqual(res.headers["X-Cache"], "HIT")
+
+        profile.location = "Kyiv"
+        profile.save()
+        res = self.client.get(PROFILE_URL, {"username": "test"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["location"], "Kyiv")
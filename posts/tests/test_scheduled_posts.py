@@ -0,0 +1,113 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post, ScheduledPost, TimelineEntry
+from posts.scheduling import publish_due
+from posts.tasks import create_post_on_a_specific_date
+from posts.views import CreatePostView
+from profiles.models import Profile
+
+POST_CREATE_URL = reverse("posts:create_post-list")
+PROFILE_URL = reverse("profiles:profiles_list-list")
+
+
+def sample_scheduled_post(**params):
+    defaults = {
+        "title": "test_title",
+        "content": "test_content",
+        "publish_at": timezone.now() - timedelta(minutes=1),
+    }
+    defaults.update(params)
+
+    return ScheduledPost.objects.create(**defaults)
+
+
+class ScheduledPostTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.user2 = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        Profile.objects.create(user=self.user1, username="test1")
+        profile2 = Profile.objects.create(user=self.user2, username="test2")
+        self.client.force_authenticate(self.user1)
+        self.client.get(PROFILE_URL + f"{profile2.id}/follow/")
+        self.client.force_authenticate(self.user2)
+
+    @mock.patch("posts.views.queue_post")
+    @mock.patch.object(
+        CreatePostView, "check_connection_to_redis", return_value=True
+    )
+    def test_future_post_is_stored_not_queued(self, _, queue_post):
+        publish_at = timezone.now() + timedelta(days=7)
+        payload = {
+            "title": "later",
+            "content": "content",
+            "created_time": publish_at.isoformat(),
+        }
+
+        with self.assertNumQueries(1):
+            res = self.client.post(POST_CREATE_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        scheduled = ScheduledPost.objects.get()
+        self.assertEqual(scheduled.owner, self.user2)
+        self.assertEqual(scheduled.publish_at, publish_at)
+        self.assertFalse(Post.objects.exists())
+        queue_post.assert_not_called()
+
+    def test_publisher_publishes_only_due_posts(self):
+        due = sample_scheduled_post(owner=self.user2)
+        sample_scheduled_post(
+            owner=self.user2, publish_at=timezone.now() + timedelta(hours=1)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(publish_due(), 1)
+
+        post = Post.objects.get()
+        self.assertEqual(post.title, due.title)
+        self.assertEqual(post.created_time, due.publish_at)
+        self.assertEqual(ScheduledPost.objects.count(), 1)
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user1, post=post).exists()
+        )
+
+    @override_settings(SCHEDULED_POSTS_BATCH_SIZE=2)
+    def test_publisher_claims_oldest_rows_in_batches(self):
+        now = timezone.now()
+        for minutes in range(5, 0, -1):
+            sample_scheduled_post(
+                owner=self.user2,
+                title=f"{minutes} minutes ago",
+                publish_at=now - timedelta(minutes=minutes),
+            )
+
+        self.assertEqual(publish_due(max_batches=2), 4)
+
+        self.assertEqual(
+            ScheduledPost.objects.get().title, "1 minutes ago"
+        )
+        self.assertEqual(publish_due(), 1)
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_legacy_task_stores_scheduled_post(self):
+        create_post_on_a_specific_date(
+            "title", "content", self.user2.id, eta="2030-01-01T10:00:00"
+        )
+
+        self.assertEqual(
+            ScheduledPost.objects.get().publish_at.year, 2030
+        )
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+POST_URL = reverse("posts:post_list-list")
+SEARCH_URL = reverse("posts:post_list-search")
+
+
+def sample_post(**params):
+    defaults = {
+        "title": "test_title",
+        "content": "test_content",
+        "owner": None,
+    }
+    defaults.update(params)
+
+    return Post.objects.create(**defaults)
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        self.in_content = sample_post(
+            owner=self.user,
+            title="Weekend",
+            content="Hiking in the mountains <b>all</b> day",
+        )
+        self.in_title = sample_post(
+            owner=self.user,
+            title="Mountains of Norway",
+            content="Fjords and mountains everywhere",
+        )
+        sample_post(owner=self.user, title="Cooking", content="Pasta")
+
+    def test_search_ranks_title_matches_first(self):
+        res = self.client.get(SEARCH_URL, {"q": "mountain"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in res.data],
+            [self.in_title.id, self.in_content.id],
+        )
+
+    def test_search_highlights_and_escapes_matches(self):
+        res = self.client.get(SEARCH_URL, {"q": "hik"})
+
+        self.assertEqual(len(res.data), 1)
+        self.assertIn("<mark>Hiking</mark>", res.data[0]["snippet"])
+        self.assertIn("&lt;b&gt;all&lt;/b&gt;", res.data[0]["snippet"])
+
+    def test_search_requires_query(self):
+        res = self.client.get(SEARCH_URL, {"q": " "})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.in_title.title = "Lakes"
+        self.in_title.content = "Water"
+        self.in_title.save()
+        self.in_content.delete()
+
+        res = self.client.get(SEARCH_URL, {"q": "mountains"})
+        self.assertEqual(res.data, [])
+
+    def test_filter_by_title_uses_title_only(self):
+        res = self.client.get(POST_URL, {"title": "mount"})
+
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]], [self.in_title.id]
+        )
@@ -0,0 +1,53 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+POST_URL = reverse("posts:post_list-list")
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        Post.objects.create(title="title", content="text", owner=self.user)
+
+    def get_posts(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get(POST_URL)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1.0)
+    def test_sampled_request_reports_phases(self):
+        with self.assertLogs("social_media_api.timing") as logs:
+            res = self.get_posts()
+
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in res.headers["Server-Timing"].split(", ")
+        }
+        self.assertEqual(set(metrics), {"sql", "view", "render", "total"})
+        self.assertIn('desc="2 queries"', metrics["sql"])
+        self.assertIn("path=/api/social-media/posts/list/", logs.output[0])
+        self.assertEqual(logs.records[0].queries, 2)
+        self.assertEqual(set(logs.records[0].durations), set(metrics))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0.5)
+    def test_unsampled_request_is_left_alone(self):
+        with mock.patch("random.random", return_value=0.7):
+            res = self.get_posts()
+
+        self.assertNotIn("Server-Timing", res.headers)
+
+    def test_disabled_middleware_is_not_loaded(self):
+        res = self.get_posts()
+
+        self.assertNotIn("Server-Timing", res.headers)
@@ -0,0 +1,138 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from posts import tasks
+from posts.models import Post, TimelineEntry
+from profiles.models import Profile
+from social_media_api import broker
+
+FOLLOWERS_POSTS_URL = reverse("posts:post_list-following-users-posts")
+PROFILE_URL = reverse("profiles:profiles_list-list")
+
+
+def sample_post(**params):
+    defaults = {
+        "title": "test_title",
+        "content": "test_content",
+        "owner": None,
+    }
+    defaults.update(params)
+
+    return Post.objects.create(**defaults)
+
+
+class HomeTimelineTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user1 = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        self.user2 = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        self.profile1 = Profile.objects.create(
+            user=self.user1, username="test1"
+        )
+        self.profile2 = Profile.objects.create(
+            user=self.user2, username="test2"
+        )
+        self.client.force_authenticate(self.user1)
+
+    def follow(self):
+        self.client.get(PROFILE_URL + f"{self.profile2.id}/follow/")
+
+    def publish(self, count: int = 1) -> list[Post]:
+        with self.captureOnCommitCallbacks(execute=True):
+            return [sample_post(owner=self.user2) for _ in range(count)]
+
+    def test_new_post_is_fanned_out_to_followers(self):
+        self.follow()
+        post, = self.publish()
+
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user1, post=post).exists()
+        )
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.user2).exists()
+        )
+
+    def test_fan_out_invalidates_feed_etag(self):
+        sample_post(owner=self.user2)
+        self.follow()
+        with mock.patch.object(broker, "monitor", available=True):
+            with mock.patch.object(tasks.fan_out_posts, "delay") as delay:
+                post, = self.publish()
+        # Read between the commit of the post and the worker's fan-out
+        etag = self.client.get(FOLLOWERS_POSTS_URL).headers["ETag"]
+
+        tasks.fan_out_posts(*delay.call_args.args)
+
+        res = self.client.get(FOLLOWERS_POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["id"], post.id)
+
+    def test_follow_backfills_and_unfollow_purges(self):
+        post = sample_post(owner=self.user2)
+        self.follow()
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user1, post=post).exists()
+        )
+
+        self.client.get(PROFILE_URL + f"{self.profile2.id}/unfollow/")
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.user1).exists()
+        )
+
+    @override_settings(TIMELINE_LENGTH=3)
+    def test_timeline_is_trimmed_on_read_and_feed_falls_back_to_pull(self):
+        self.follow()
+        posts = self.publish(5)
+        entries = TimelineEntry.objects.filter(user=self.user1)
+        self.assertEqual(entries.count(), 5)
+
+        res = self.client.get(FOLLOWERS_POSTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]],
+            [post.id for post in reversed(posts)],
+        )
+        self.assertEqual(
+            set(entries.values_list("post_id", flat=True)),
+            {post.id for post in posts[-3:]},
+        )
+
+    @override_settings(TIMELINE_LENGTH=3)
+    def test_feed_pages_continue_past_trimmed_timeline(self):
+        self.follow()
+        posts = self.publish(5)
+
+        seen = []
+        url = FOLLOWERS_POSTS_URL + "?page_size=2"
+        while url:
+            res = self.client.get(url)
+            seen.extend(post["id"] for post in res.data["results"])
+            url = res.data["next"]
+
+        self.assertEqual(seen, [post.id for post in reversed(posts)])
+
+    def test_cold_timeline_is_rebuilt_on_read(self):
+        self.follow()
+        post = sample_post(owner=self.user2)
+        TimelineEntry.objects.all().delete()
+
+        res = self.client.get(FOLLOWERS_POSTS_URL)
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [post.id]
+        )
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user1, post=post).exists()
+        )
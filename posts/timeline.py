@@ -0,0 +1,183 @@
+"""
+Fan-out-on-write home timelines.
+
+When a post is created its id is copied into the timeline of every user
+following its owner, so the followings feed is read with one index range
+scan over ``TimelineEntry`` instead of joining every followed user's
+posts on each request. The fan-out runs on the worker, in chunks, and
+does not trim; a timeline is trimmed to ``TIMELINE_LENGTH`` entries when
+its first page is read. Older posts and timelines that were never
+materialized are served by the pull query.
+"""
+from collections import defaultdict
+from itertools import islice
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import RowNumber
+from rest_framework.request import Request
+
+from posts.models import Post, TimelineEntry
+from profiles.models import Profile
+from social_media_api.generations import bump_generation
+from social_media_api.pagination import PostPagination
+
+BATCH_SIZE = 1000
+
+
+def get_timeline_length() -> int:
+    return getattr(settings, "TIMELINE_LENGTH", 800)
+
+
+def pull_query(user) -> QuerySet[Post]:
+    """Posts of everyone the user follows, newest first"""
+    return Post.objects.filter(
+        owner__in=user.profile.following.all()
+    ).order_by("-created_time", "-id")
+
+
+def _followers_by_owner(owner_ids: Iterable[int]) -> dict[int, list[int]]:
+    """Map every owner id to the ids of the users following them"""
+    rows = Profile.following.through.objects.filter(
+        user_id__in=owner_ids
+    ).values_list("user_id", "profile__user_id")
+    followers = defaultdict(list)
+    for owner_id, follower_id in rows:
+        followers[owner_id].append(follower_id)
+    return followers
+
+
+def _insert_entries(entries: Iterable[TimelineEntry]) -> int:
+    """
+    Insert entries a chunk at a time, without building them all; return
+    how many were given
+    """
+    entries = iter(entries)
+    inserted = 0
+    while batch := list(islice(entries, BATCH_SIZE)):
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        inserted += len(batch)
+    return inserted
+
+
+def trim_timelines(user_ids: Iterable[int]) -> None:
+    """Delete everything past the newest TIMELINE_LENGTH entries"""
+    user_ids = list(user_ids)
+    length = get_timeline_length()
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        stale_ids = list(
+            TimelineEntry.objects.filter(
+                user_id__in=user_ids[start:start + BATCH_SIZE]
+            )
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=F("user_id"),
+                    order_by=[
+                        F("created_time").desc(),
+                        F("post_id").desc(),
+                    ],
+                )
+            )
+            .filter(position__gt=length)
+            .values_list("id", flat=True)
+        )
+        if stale_ids:
+            TimelineEntry.objects.filter(id__in=stale_ids).delete()
+
+
+def fan_out_posts(posts: Iterable[Post]) -> None:
+    """Copy freshly created posts into their owners' followers timelines"""
+    posts = list(posts)
+    if not posts:
+        return
+    followers = _followers_by_owner({post.owner_id for post in posts})
+    if _insert_entries(
+        TimelineEntry(
+            user_id=follower_id,
+            post_id=post.id,
+            created_time=post.created_time,
+        )
+        for post in posts
+        for follower_id in followers.get(post.owner_id, ())
+    ):
+        # Feeds read before the fan-out must not stay valid
+        bump_generation("posts")
+
+
+def backfill(user, followed_user_id: int) -> None:
+    """Merge the newest posts of a just followed user into the timeline"""
+    posts = Post.objects.filter(owner_id=followed_user_id).order_by(
+        "-created_time", "-id"
+    ).values_list("id", "created_time")[:get_timeline_length()]
+    if _insert_entries(
+        TimelineEntry(user=user, post_id=post_id, created_time=created_time)
+        for post_id, created_time in posts
+    ):
+        trim_timelines([user.id])
+        bump_generation("posts")
+
+
+def purge(user, unfollowed_user_id: int) -> None:
+    """Drop the posts of an unfollowed user from the timeline"""
+    deleted, _ = TimelineEntry.objects.filter(
+        user=user, post__owner_id=unfollowed_user_id
+    ).delete()
+    if deleted:
+        bump_generation("posts")
+
+
+def rebuild(user) -> list[int]:
+    """Materialize a cold timeline from the pull query"""
+    posts = list(
+        pull_query(user).values_list("id", "created_time")[
+            :get_timeline_length()
+        ]
+    )
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user=user, post_id=post_id, created_time=created)
+            for post_id, created in posts
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return [post_id for post_id, _ in posts]
+
+
+class TimelinePagination(PostPagination):
+    ordering = ("-created_time", "-post_id")
+
+
+def paginate_home_timeline(
+    user, request: Request, view=None
+) -> tuple[list[Post], PostPagination]:
+    """
+    Return one page of the followings feed and the paginator it came from.
+    The page is read from the materialized timeline; a cold timeline is
+    rebuilt from the pull query first, a warm one is trimmed after its
+    first page is read. Once the reader walks past the end
+    of a full timeline, whose older entries may have been trimmed, the
+    same cursor is served by the pull query instead, since both order by
+    (created_time, post id).
+    """
+    entries = TimelineEntry.objects.filter(user=user)
+    length = get_timeline_length()
+    paginator = TimelinePagination()
+    page = paginator.paginate_queryset(entries, request, view)
+    if paginator.cursor is None:
+        if not page and rebuild(user):
+            page = paginator.paginate_queryset(entries, request, view)
+        elif entries[length:length + 1].exists():
+            trim_timelines([user.id])
+    # Probe single rows: counting would read the whole timeline
+    if not paginator.has_next and entries[length - 1:length].exists():
+        paginator = PostPagination()
+        return paginator.paginate_queryset(
+            pull_query(user), request, view
+        ), paginator
+    posts = Post.objects.in_bulk([entry.post_id for entry in page])
+    return [
+        posts[entry.post_id] for entry in page if entry.post_id in posts
+    ], paginator
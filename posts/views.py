@@ -1,30 +1,61 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from typing import Optional
 
-import redis
-from django.db.models import QuerySet
-from django.http import HttpResponseRedirect
-from django.urls import reverse
+from django.db.models import Prefetch, QuerySet
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import permissions, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.viewsets import GenericViewSet
 
-from posts.tasks import create_post_on_a_specific_date
-from comments.serializers import CommentaryCreateSerializer
-from likes.models import Like, Dislike
-from likes.serializers import LikeCreateSerializer, LikeDeleteSerializer
+from posts import counter_buffer, timeline
+from posts.bulk import MAX_POSTS, create_posts, split_scheduled
+from posts.search import get_search_backend, render_highlight
+from posts.scheduling import schedule_posts
+from posts.tasks import queue_post
+from comments.models import Commentary
+from comments.serializers import (
+    CommentaryCreateSerializer,
+    CommentarySerializer,
+)
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
+from likes import reactions
+from likes.models import Reaction
+from likes.serializers import ReactionSerializer
+from social_media_api.broker import is_broker_available, record_failure
+from social_media_api.conditional import (
+    ConditionalGetMixin,
+    Validators,
+    conditional,
+)
+from social_media_api.response_cache import ResponseCacheMixin
+from social_media_api.timing import ServerTimingMixin, phase
+from social_media_api.redirects import legacy_redirect
+from social_media_api.pagination import (
+    CommentaryPagination,
+    KeysetPagination,
+    PostPagination,
+    ReactionPagination,
+)
 from .models import Post
 from .serializers import (
+    NESTED_LIMIT,
     PostSerializer,
+    PostBulkCreateResultSerializer,
+    PostBulkCreateSerializer,
     PostCreateSerializer,
     PostDetailSerializer,
     PostCreateWithoutWorkerSerializer,
+    PostSearchSerializer,
+    ReactionStateSerializer,
 )
 
 
@@ -38,51 +69,84 @@ class CreatePostView(
 
     @staticmethod
     def check_connection_to_redis() -> bool:
-        """Check if redis run and return True or False"""
-        redis_client = redis.Redis(host="localhost", port=6379)
-        try:
-            redis_client.ping()
-        except redis.exceptions.ConnectionError:
-            return False
-        else:
-            return True
+        """
+        Return the broker state cached by the health monitor,
+        without any network round trip
+        """
+        return is_broker_available()
 
     def get_serializer_class(self):
+        if self.action == "bulk":
+            return PostBulkCreateSerializer
         if not self.check_connection_to_redis():
             return PostCreateWithoutWorkerSerializer
         return self.serializer_class
 
+    @extend_schema(
+        request=PostBulkCreateSerializer(many=True),
+        responses={201: PostBulkCreateResultSerializer},
+    )
+    @action(methods=["POST"], detail=False, url_path="bulk")
+    def bulk(self, request: Request) -> Response:
+        """
+        Endpoint for creating up to MAX_POSTS posts in one request.
+        Posts with a future 'created_time' are stored for the scheduled
+        post publisher when the worker is reachable, every other post
+        is inserted right away in batches.
+        """
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=MAX_POSTS,
+        )
+        serializer.is_valid(raise_exception=True)
+        due, scheduled = split_scheduled(serializer.validated_data)
+        if scheduled and not self.check_connection_to_redis():
+            due += [{**item, "created_time": None} for item in scheduled]
+            scheduled = []
+        posts = create_posts(request.user.id, due)
+        if scheduled:
+            schedule_posts(request.user.id, scheduled)
+        return Response(
+            {
+                "created": [post.id for post in posts],
+                "scheduled": len(scheduled),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
     def perform_create(self, serializer: Serializer[Post]) -> None:
         """
         Perform the creation of a post.
         If the connection to Redis is available,
-        the post will be scheduled to be created at a specific date and time
-        specified by the 'created_time' field in the request data.
-        If 'created_time' is not provided, the current time
-        will be used.
-        If the connection to Redis is not available,
-        the post will be created immediately.
+        a post with a future 'created_time' is stored as a scheduled post
+        and published by the periodic publisher task at that time,
+        any other post is created by the worker.
+        If the connection to Redis is not available, or the message
+        cannot be sent, the post will be created immediately.
         """
         if self.check_connection_to_redis():
-            created_time = self.request.data.get("created_time")
-            if not created_time:
-                created_time = timezone.now().strftime("%Y-%m-%dT%H:%M")
-            title = self.request.data.get("title")
-            content = self.request.data.get("content")
-            eta = datetime.strptime(created_time, "%Y-%m-%dT%H:%M")
-            create_post_on_a_specific_date.apply_async(
-                args=[
-                    title,
-                    content,
-                    self.request.user.id,
-                ],
-                kwargs={"eta": eta},
-            )
-        else:
-            serializer.save(owner=self.request.user)
+            data = serializer.validated_data
+            created_time = data.get("created_time")
+            if created_time and created_time > timezone.now():
+                schedule_posts(self.request.user.id, [data])
+                return
+            try:
+                with phase("broker"):
+                    queue_post(
+                        data["title"], data["content"], self.request.user.id
+                    )
+                return
+            except (OperationalError, RedisError):
+                record_failure()
+        serializer.save(owner=self.request.user)
 
 
 class PostListView(
+    ServerTimingMixin,
+    ConditionalGetMixin,
+    ResponseCacheMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
@@ -90,17 +154,119 @@ class PostListView(
     serializer_class = PostSerializer
     queryset = Post.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PostPagination
+    generation_resource = "posts"
+    cache_per_user = True
+
+    def object_validators(self) -> Validators:
+        """Validators of the post, covering its unflushed counter deltas"""
+        etag, last_modified = super().object_validators()
+        if etag is None or not counter_buffer.is_enabled():
+            return etag, last_modified
+        pending = counter_buffer.pending_deltas([int(self.kwargs["pk"])])
+        changes = next(iter(pending.values()), {})
+        if not any(changes.values()):
+            return etag, last_modified
+        version = ".".join(
+            str(changes.get(field, 0)) for field in counter_buffer.FIELDS
+        )
+        return f'{etag[:-1]}+{version}"', None
 
     def get_queryset(self) -> QuerySet[Post]:
         """Filtering posts by title and created_time"""
-        queryset = self.queryset
+        queryset = self.filter_by_created_time(self.queryset)
+        if self.action == "retrieve":
+            queryset = self.prefetch_nested(queryset)
         title = self.request.query_params.get("title")
-        created_time = self.request.query_params.get("created_time")
         if title:
-            return queryset.filter(title__icontains=title)
+            queryset = get_search_backend().filter(
+                queryset, title, title_only=True
+            )
+        return queryset
+
+    @staticmethod
+    def prefetch_nested(queryset: QuerySet[Post]) -> QuerySet[Post]:
+        """Prefetch the first page of every collection shown on a post"""
+        return queryset.prefetch_related(
+            Prefetch(
+                "commentaries",
+                to_attr="first_commentaries",
+                queryset=Commentary.objects.select_related(
+                    "user__profile"
+                ).order_by("created_time", "id")[:NESTED_LIMIT],
+            ),
+            Prefetch(
+                "reactions",
+                to_attr="first_likes",
+                queryset=Reaction.objects.filter(value=Reaction.Value.LIKE)
+                .select_related("user__profile")
+                .order_by("id")[:NESTED_LIMIT],
+            ),
+            Prefetch(
+                "reactions",
+                to_attr="first_dislikes",
+                queryset=Reaction.objects.filter(
+                    value=Reaction.Value.DISLIKE
+                )
+                .select_related("user__profile")
+                .order_by("id")[:NESTED_LIMIT],
+            ),
+        )
+
+    @staticmethod
+    def start_of_day(day: date) -> datetime:
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    def parse_moment(self, name: str, value: str) -> datetime:
+        """Parse an ISO date or datetime into an aware datetime"""
+        error = ValidationError(
+            {name: ["Expected an ISO 8601 date or datetime."]}
+        )
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                if day is None:
+                    raise error
+                return self.start_of_day(day)
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+        except (ValueError, OverflowError) as exc:
+            # Well-formed, but out of range, like 2023-02-30
+            raise error from exc
+        return moment
+
+    def filter_by_created_time(
+        self, queryset: QuerySet[Post]
+    ) -> QuerySet[Post]:
+        """
+        Filter by the created_time day and the since (inclusive) and until
+        (exclusive) bounds. Every filter is a half-open range on the raw
+        column, so the created_time indexes can serve it.
+        """
+        params = self.request.query_params
+        created_time = params.get("created_time")
         if created_time:
-            date = datetime.strptime(created_time, "%Y-%m-%d").date()
-            queryset = queryset.filter(created_time__date=date)
+            error = ValidationError(
+                {"created_time": ["Expected a date as YYYY-MM-DD."]}
+            )
+            try:
+                day = parse_date(created_time)
+                if day is None:
+                    raise error
+                start = self.start_of_day(day)
+                end = self.start_of_day(day + timedelta(days=1))
+            except (ValueError, OverflowError) as exc:
+                raise error from exc
+            queryset = queryset.filter(
+                created_time__gte=start, created_time__lt=end
+            )
+        for name, lookup in (("since", "gte"), ("until", "lt")):
+            value = params.get(name)
+            if value:
+                queryset = queryset.filter(**{
+                    f"created_time__{lookup}": self.parse_moment(name, value)
+                })
         return queryset
 
     def get_serializer_class(self):
@@ -108,35 +274,32 @@ class PostListView(
             return CommentaryCreateSerializer
         if self.action == "retrieve":
             return PostDetailSerializer
-        if self.action == "like":
-            return LikeCreateSerializer
-        if self.action == "dislike":
-            return LikeDeleteSerializer
+        if self.action == "search":
+            return PostSearchSerializer
+        if self.action == "comments":
+            return CommentarySerializer
+        if self.action in (
+            "likes", "dislikes", "like", "dislike", "clear_reaction"
+        ):
+            return ReactionSerializer
         return self.serializer_class
 
-    @staticmethod
-    def create_dislike(post: Post, user) -> None:
-        dislike = Dislike.objects.create(user=user, post=post)
-        post.dislikes.add(dislike)
-        post.save()
-
-    @staticmethod
-    def create_like(post: Post, user) -> None:
-        likes = Like.objects.create(user=user, post=post)
-        post.likes.add(likes)
-        post.save()
-
     @action(
         methods=["GET"],
         detail=False,
         url_path="my-posts",
         permission_classes=[permissions.IsAuthenticated],
     )
+    @conditional("collection_validators")
     def my_posts(self, request: Request) -> Response:
         """Endpoint for get all post current user"""
-        posts = Post.objects.filter(owner=request.user)
+        posts = self.paginate_queryset(
+            self.filter_by_created_time(
+                Post.objects.filter(owner=request.user)
+            )
+        )
         serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_paginated_response(serializer.data)
 
     @action(
         methods=["GET"],
@@ -144,16 +307,133 @@ class PostListView(
         url_path="followings-posts",
         permission_classes=[permissions.IsAuthenticated],
     )
+    @conditional("collection_validators")
     def following_users_posts(self, request: Request) -> Response:
         """Endpoint for get followers posts"""
-        user = request.user
-        following = user.profile.following.all()
-        posts = Post.objects.filter(
-            owner__in=following
-        ).order_by("-created_time")
+        posts, paginator = timeline.paginate_home_timeline(
+            request.user, request, self
+        )
         serializer = self.get_serializer(posts, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                required=True,
+                description="Words or word prefixes to find in title "
+                            "or content (ex. ?q=djan rest)",
+            ),
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="search",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    @conditional("collection_validators")
+    def search(self, request: Request) -> Response:
+        """Endpoint for ranked full-text search over posts"""
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"q": ["This query parameter is required."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        hits = get_search_backend().search(
+            query, self.paginator.get_page_size(request)
+        )
+        posts = Post.objects.in_bulk([hit.post_id for hit in hits])
+        results = []
+        for hit in hits:
+            post = posts.get(hit.post_id)
+            if post is None:
+                continue
+            post.rank = hit.rank
+            post.highlighted_title = render_highlight(hit.title)
+            post.snippet = render_highlight(hit.snippet)
+            results.append(post)
+        serializer = self.get_serializer(results, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def paginate_post_collection(
+        self, queryset: QuerySet, paginator: KeysetPagination, pk
+    ) -> Response:
+        """Respond with one page of a collection belonging to the post"""
+        if not Post.objects.filter(pk=pk).exists():
+            raise NotFound()
+        page = paginator.paginate_queryset(queryset, self.request, self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "order",
+                type=OpenApiTypes.STR,
+                enum=list(CommentaryPagination.orderings),
+                description="oldest (default) or newest comments first",
+            ),
+            OpenApiParameter(
+                "cursor",
+                type=OpenApiTypes.STR,
+                description="Cursor from the next or previous link",
+            ),
+        ]
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="comments",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def comments(self, request: Request, pk: Optional[int]) -> Response:
+        """
+        Endpoint for the comment thread of a post, oldest or newest first.
+        Pages seek on the (post, created_time, id) index.
+        """
+        return self.paginate_post_collection(
+            Commentary.objects.filter(post_id=pk).select_related(
+                "user__profile"
+            ),
+            CommentaryPagination(),
+            pk,
+        )
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="likes",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def likes(self, request: Request, pk: Optional[int]) -> Response:
+        """Endpoint for paginated likes of a post"""
+        return self.paginate_post_collection(
+            Reaction.objects.filter(
+                post_id=pk, value=Reaction.Value.LIKE
+            ).select_related("user__profile"),
+            ReactionPagination(),
+            pk,
+        )
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="dislikes",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def dislikes(self, request: Request, pk: Optional[int]) -> Response:
+        """Endpoint for paginated dislikes of a post"""
+        return self.paginate_post_collection(
+            Reaction.objects.filter(
+                post_id=pk, value=Reaction.Value.DISLIKE
+            ).select_related("user__profile"),
+            ReactionPagination(),
+            pk,
+        )
+
     @action(
         methods=["POST"],
         detail=True,
@@ -170,25 +450,40 @@ class PostListView(
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def reaction_state(
+        self, pk: Optional[int], value: Optional[int]
+    ) -> Response:
+        """The user's new reaction and the post counters after it"""
+        redirect = legacy_redirect("posts:post_list-list")
+        if redirect:
+            return redirect
+        post = get_object_or_404(
+            Post.objects.only("likes_count", "dislikes_count"), pk=pk
+        )
+        counter_buffer.apply_pending([post])
+        serializer = ReactionStateSerializer(
+            {
+                "liked": value == Reaction.Value.LIKE,
+                "disliked": value == Reaction.Value.DISLIKE,
+                "likes_count": post.likes_count,
+                "dislikes_count": post.dislikes_count,
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(request=None, responses=ReactionStateSerializer)
     @action(
         methods=["GET", "POST"],
         detail=True,
         url_path="like",
         permission_classes=[permissions.IsAuthenticated],
     )
-    def like(
-            self, request: Request, pk: Optional[int]
-    ) -> HttpResponseRedirect:
+    def like(self, request: Request, pk: Optional[int]) -> Response:
         """Endpoint for like post"""
-        user = self.request.user
-        post = Post.objects.get(pk=pk)
-        if post.dislikes.filter(user=user).exists():
-            post.dislikes.get(user=user).delete()
-            self.create_like(post, user)
-        if not post.likes.filter(user=user).exists():
-            self.create_like(post, user)
-        return HttpResponseRedirect(reverse("posts:post_list-list"))
+        reactions.react(pk, self.request.user.id, Reaction.Value.LIKE)
+        return self.reaction_state(pk, Reaction.Value.LIKE)
 
+    @extend_schema(request=None, responses=ReactionStateSerializer)
     @action(
         methods=["GET", "POST"],
         detail=True,
@@ -197,32 +492,50 @@ class PostListView(
             permissions.IsAuthenticated
         ],
     )
-    def dislike(
-            self, request: Request, pk: Optional[int]
-    ) -> HttpResponseRedirect:
+    def dislike(self, request: Request, pk: Optional[int]) -> Response:
         """Endpoint for dislike post"""
-        user = self.request.user
-        post = Post.objects.get(pk=pk)
-        if post.likes.filter(user=user).exists():
-            post.likes.get(user=user).delete()
-            self.create_dislike(post, user)
-        if not post.dislikes.filter(user=user).exists():
-            self.create_dislike(post, user)
-        return HttpResponseRedirect(reverse("posts:post_list-list"))
+        reactions.react(pk, self.request.user.id, Reaction.Value.DISLIKE)
+        return self.reaction_state(pk, Reaction.Value.DISLIKE)
+
+    @extend_schema(request=None, responses=ReactionStateSerializer)
+    @action(
+        methods=["POST", "DELETE"],
+        detail=True,
+        url_path="clear-reaction",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def clear_reaction(
+            self, request: Request, pk: Optional[int]
+    ) -> Response:
+        """Endpoint for removing the like or dislike of a post"""
+        reactions.clear(pk, self.request.user.id)
+        return self.reaction_state(pk, None)
 
     @extend_schema(
         parameters=[
             OpenApiParameter(
                 "title",
                 type=OpenApiTypes.STR,
-                description="Filter by title name "
-                            "(ex. ?title=something)",
+                description="Filter by words or word prefixes "
+                            "in title (ex. ?title=something)",
             ),
             OpenApiParameter(
                 "created_time",
                 type=OpenApiTypes.DATE,
                 description="Filter by created_time of posts "
-                            "(ex. ?date=2022-10-23)",
+                            "(ex. ?created_time=2022-10-23)",
+            ),
+            OpenApiParameter(
+                "since",
+                type=OpenApiTypes.DATETIME,
+                description="Posts created at or after this moment "
+                            "(ex. ?since=2022-10-23T10:00)",
+            ),
+            OpenApiParameter(
+                "until",
+                type=OpenApiTypes.DATETIME,
+                description="Posts created before this moment "
+                            "(ex. ?until=2022-10-24)",
             ),
         ]
     )
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("profiles", "0006_alter_profile_bio_alter_profile_location_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -40,6 +40,7 @@ class Profile(models.Model):
         related_name="following",
         blank=True,
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.username
@@ -90,3 +90,8 @@ class ProfileUploadImageSerializer(serializers.ModelSerializer):
             "id",
             "profile_picture"
         ]
+
+
+class FollowStateSerializer(serializers.Serializer):
+    following = serializers.BooleanField()
+    followers_count = serializers.IntegerField()
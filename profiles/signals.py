@@ -0,0 +1,34 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from profiles.models import Profile
+from social_media_api.generations import bump_generation
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def bump_profiles_generation(sender, **kwargs) -> None:
+    bump_generation("profiles")
+
+
+@receiver(m2m_changed, sender=Profile.following.through)
+@receiver(m2m_changed, sender=Profile.followers.through)
+def touch_profile_on_follow(
+    sender, instance, action: str, reverse: bool, **kwargs
+) -> None:
+    """
+    Follow graph changes alter profile details, profile lists and the
+    followings feed, so mark all of them as modified
+    """
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        Profile.objects.filter(
+            pk__in=kwargs.get("pk_set") or ()
+        ).update(updated_at=timezone.now())
+    else:
+        Profile.objects.filter(pk=instance.pk).update(
+            updated_at=timezone.now()
+        )
+    bump_generation("profiles", "posts")
@@ -67,7 +67,7 @@ class AuthenticatedProfileApiTests(TestCase):
         profiles = Profile.objects.order_by("id")
         serializer = ProfileListSerializer(profiles, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_filter_profiles_by_username(self):
         profile1 = sample_profile(user=self.user1)
@@ -81,8 +81,8 @@ class AuthenticatedProfileApiTests(TestCase):
         serializer2 = ProfileListSerializer(profile2)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer1.data, res.data)
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer1.data, res.data["results"])
 
     def test_filter_profiles_by_location(self):
         profile1 = sample_profile(user=self.user1, location="test2loc")
@@ -100,8 +100,8 @@ class AuthenticatedProfileApiTests(TestCase):
         serializer2 = ProfileListSerializer(profile2)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer1.data, res.data)
+        self.assertIn(serializer2.data, res.data["results"])
+        self.assertNotIn(serializer1.data, res.data["results"])
 
     def test_create_profile(self):
         data = {
@@ -120,12 +120,16 @@ class AuthenticatedProfileApiTests(TestCase):
         user2 = sample_profile(user=self.user2, username="test31")
         self.client.force_authenticate(user=self.user1)
         res = self.client.get(PROFILE_URL + f"{user2.id}/follow/")
-        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"following": True, "followers_count": 1})
         self.assertTrue(user1.following.filter(id=user2.id).exists())
         self.assertTrue(user2.followers.filter(id=user1.id).exists())
 
         res2 = self.client.get(PROFILE_URL + f"{user2.id}/unfollow/")
-        self.assertEqual(res2.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(res2.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res2.data, {"following": False, "followers_count": 0}
+        )
         self.assertFalse(
             user1.following.filter(id=user2.id).exists()
         )
@@ -133,6 +137,21 @@ class AuthenticatedProfileApiTests(TestCase):
             user2.followers.filter(id=user1.id).exists()
         )
 
+    def test_retrieve_not_modified_until_followed(self):
+        sample_profile(user=self.user1)
+        profile2 = sample_profile(user=self.user2, username="test31")
+        self.client.force_authenticate(user=self.user1)
+        url = PROFILE_URL + f"{profile2.id}/"
+        etag = self.client.get(url).headers["ETag"]
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.get(url + "follow/")
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["followers"], [self.user1.email])
+
     def test_update_profile(self):
         profile = sample_profile(user=self.user1)
         data = {"username": "AnotherUsername"}
@@ -190,4 +209,4 @@ class ProfileImageUploadTests(TestCase):
             self.client.post(url, {"profile_picture": ntf}, format="multipart")
         res = self.client.get(PROFILE_URL)
 
-        self.assertIn("profile_picture", res.data[0].keys())
+        self.assertIn("profile_picture", res.data["results"][0].keys())
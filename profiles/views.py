@@ -1,17 +1,17 @@
 from typing import Optional, Type
 
 from django.db.models import QuerySet
-from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, permissions, status
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.reverse import reverse
 from rest_framework.serializers import Serializer
 from rest_framework.viewsets import GenericViewSet
 
+from posts import timeline
 from profiles.models import Profile
 from profiles.permissions import (
     HasProfilePermission,
@@ -24,10 +24,19 @@ from profiles.serializers import (
     UpdateProfileSerializer,
     ProfileCreateSerializer,
     ProfileUploadImageSerializer,
+    FollowStateSerializer,
 )
+from social_media_api.conditional import ConditionalGetMixin
+from social_media_api.pagination import ProfilePagination
+from social_media_api.redirects import legacy_redirect
+from social_media_api.response_cache import ResponseCacheMixin
+from social_media_api.timing import ServerTimingMixin
 
 
 class ProfileListViewSet(
+    ServerTimingMixin,
+    ConditionalGetMixin,
+    ResponseCacheMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
@@ -35,6 +44,8 @@ class ProfileListViewSet(
     serializer_class = ProfileListSerializer
     queryset = Profile.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ProfilePagination
+    generation_resource = "profiles"
 
     def get_queryset(self) -> QuerySet[Profile]:
         """Filtering by username and location"""
@@ -53,6 +64,21 @@ class ProfileListViewSet(
             return ProfileDetailSerializer
         return self.serializer_class
 
+    @staticmethod
+    def follow_state(profile: Profile, following: bool) -> Response:
+        """Whether the user follows ``profile`` and its followers count"""
+        redirect = legacy_redirect("profiles:profiles_list-list")
+        if redirect:
+            return redirect
+        serializer = FollowStateSerializer(
+            {
+                "following": following,
+                "followers_count": profile.followers.count(),
+            }
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(request=None, responses=FollowStateSerializer)
     @action(
         methods=["GET", "PATCH"],
         detail=True,
@@ -62,17 +88,16 @@ class ProfileListViewSet(
             CannotSubscribeYourselfPermission,
         ],
     )
-    def unfollow(
-            self, request: Request, pk: Optional[int]
-    ) -> HttpResponseRedirect:
+    def unfollow(self, request: Request, pk: Optional[int]) -> Response:
         """Endpoint for unfollow user"""
         profile = self.request.user.profile
-        unfollow_user_profile = Profile.objects.get(pk=pk)
+        unfollow_user_profile = get_object_or_404(Profile, pk=pk)
         profile.following.remove(unfollow_user_profile.user.id)
         unfollow_user_profile.followers.remove(self.request.user)
-        redirect_url = reverse("profiles:profiles_list-list")
-        return HttpResponseRedirect(redirect_url)
+        timeline.purge(self.request.user, unfollow_user_profile.user_id)
+        return self.follow_state(unfollow_user_profile, following=False)
 
+    @extend_schema(request=None, responses=FollowStateSerializer)
     @action(
         methods=["GET", "PATCH"],
         detail=True,
@@ -82,16 +107,14 @@ class ProfileListViewSet(
             CannotSubscribeYourselfPermission,
         ],
     )
-    def follow(
-            self, request: Request, pk: Optional[int]
-    ) -> HttpResponseRedirect:
+    def follow(self, request: Request, pk: Optional[int]) -> Response:
         """Endpoint for follow user"""
         profile = self.request.user.profile
-        follow_user_profile = Profile.objects.get(pk=pk)
+        follow_user_profile = get_object_or_404(Profile, pk=pk)
         profile.following.add(follow_user_profile.user.id)
         follow_user_profile.followers.add(self.request.user)
-        redirect_url = reverse("profiles:profiles_list-list")
-        return HttpResponseRedirect(redirect_url)
+        timeline.backfill(self.request.user, follow_user_profile.user_id)
+        return self.follow_state(follow_user_profile, following=True)
 
     @extend_schema(
         parameters=[
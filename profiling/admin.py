@@ -0,0 +1,78 @@
+import os
+
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "mode",
+        "user",
+    )
+    list_filter = ("mode", "method")
+    search_fields = ("path",)
+    fields = (
+        "created_at",
+        "user",
+        "mode",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "download",
+        "top_functions",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "<int:pk>/stacks/",
+                self.admin_site.admin_view(self.stacks_view),
+                name="profiling_requestprofile_stacks",
+            ),
+        ] + super().get_urls()
+
+    def stacks_view(self, request, pk: int) -> FileResponse:
+        """The profiler output, only for staff who may view profiles"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        try:
+            stacks = profile.stacks.open("rb")
+        except FileNotFoundError as error:
+            raise Http404 from error
+        return FileResponse(
+            stacks,
+            as_attachment=True,
+            filename=os.path.basename(profile.stacks.name),
+        )
+
+    @admin.display(description="Stacks")
+    def download(self, profile: RequestProfile) -> str:
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse(
+                "admin:profiling_requestprofile_stacks", args=[profile.pk]
+            ),
+            os.path.basename(profile.stacks.name),
+        )
+
+    @admin.display(description="Top functions")
+    def top_functions(self, profile: RequestProfile) -> str:
+        return format_html("<pre>{}</pre>", profile.table)
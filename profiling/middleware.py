@@ -0,0 +1,100 @@
+"""
+On-demand profiling of single requests by staff users.
+
+A request asks to be profiled with an ``X-Profile`` header or a
+``profile`` query parameter, ``sample`` (the default) for the stack
+sampler or ``cprofile``. Only staff users are profiled, and only
+PROFILER_SAMPLE_RATE of their flagged requests. The output is stored
+under a random name in the private storage as a ``RequestProfile``,
+listed and downloadable in the admin, and its id is returned in the
+``X-Profile-Id`` header.
+
+Every other request only pays for a header and a query lookup.
+"""
+import random
+import time
+import uuid
+from typing import Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.http import HttpRequest, HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from profiling.models import RequestProfile
+from profiling.profilers import CProfiler, StackSampler
+
+HEADER = "HTTP_X_PROFILE"
+QUERY_PARAM = "profile"
+
+
+def requested_mode(request: HttpRequest) -> Optional[str]:
+    flag = request.META.get(HEADER) or request.GET.get(QUERY_PARAM)
+    if not flag:
+        return None
+    if flag in RequestProfile.Mode.values:
+        return flag
+    return RequestProfile.Mode.SAMPLE
+
+
+def staff_user(request: HttpRequest):
+    """The staff user of a session or of a JWT, if any"""
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except APIException:
+            return None
+        user = authenticated[0] if authenticated else None
+    if user is not None and user.is_staff:
+        return user
+    return None
+
+
+class ProfilerMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        mode = requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+        user = staff_user(request)
+        sample_rate = getattr(settings, "PROFILER_SAMPLE_RATE", 1.0)
+        if user is None or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        if mode == RequestProfile.Mode.CPROFILE:
+            profiler = CProfiler()
+            extension = "prof"
+        else:
+            profiler = StackSampler(
+                getattr(settings, "PROFILER_INTERVAL", 0.001)
+            )
+            extension = "collapsed.txt"
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        duration = time.perf_counter() - started
+
+        profile = RequestProfile(
+            user=user,
+            mode=mode,
+            method=request.method,
+            path=request.get_full_path()[:2000],
+            status_code=response.status_code,
+            duration_ms=round(duration * 1000, 2),
+            table=profiler.table(getattr(settings, "PROFILER_TOP", 40)),
+        )
+        profile.stacks.save(
+            f"{uuid.uuid4().hex}.{extension}",
+            ContentFile(profiler.output()),
+            save=False,
+        )
+        profile.save()
+        response["X-Profile-Id"] = str(profile.pk)
+        return response
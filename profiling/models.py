@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db import models
+
+from social_media_api.storage import private_storage
+
+
+class RequestProfile(models.Model):
+    """Profile of one request, taken on demand by a staff user."""
+
+    class Mode(models.TextChoices):
+        SAMPLE = "sample", "Stack sampler"
+        CPROFILE = "cprofile", "cProfile"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="request_profiles",
+    )
+    mode = models.CharField(max_length=10, choices=Mode.choices)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    # Collapsed stacks for the sampler, a pstats dump for cProfile; only
+    # downloadable from the admin
+    stacks = models.FileField(
+        upload_to="request-profiles/", storage=private_storage
+    )
+    table = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self) -> str:
+        return f"{self.method} {self.path} ({self.get_mode_display()})"
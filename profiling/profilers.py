@@ -0,0 +1,107 @@
+"""
+Profilers for a single request.
+
+``StackSampler`` looks at the stack of the profiled thread every
+``interval`` seconds from a background thread, so the request itself
+runs at full speed; it yields collapsed stacks ("root;...;leaf count"
+per line, the input of flamegraph.pl and speedscope). ``CProfiler``
+records every call with cProfile and yields a pstats dump. Both give a
+top-N table of the hottest functions.
+"""
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+from django.conf import settings
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    base = f"{settings.BASE_DIR}{os.sep}"
+    if filename.startswith(base):
+        filename = filename[len(base):]
+    elif "site-packages" in filename:
+        filename = filename.rsplit(f"site-packages{os.sep}", 1)[1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def output(self) -> bytes:
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self.stacks.most_common()
+        ).encode()
+
+    def table(self, limit: int) -> str:
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        samples = sum(self.stacks.values())
+        lines = [
+            f"{samples} samples, one every {self.interval * 1000:g} ms",
+            "",
+            f"{'own':>8}{'total':>8}  function",
+        ]
+        lines.extend(
+            f"{own[label]:>8}{count:>8}  {label}"
+            for label, count in total.most_common(limit)
+        )
+        return "\n".join(lines) + "\n"
+
+
+class CProfiler:
+    def __init__(self) -> None:
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profiler.enable()
+
+    def stop(self) -> None:
+        self.profiler.disable()
+
+    def output(self) -> bytes:
+        """The ``pstats`` dump, as written by ``Profile.dump_stats``"""
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+    def table(self, limit: int) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+        return stream.getvalue()
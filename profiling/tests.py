@@ -0,0 +1,117 @@
+import os
+import pstats
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from posts.models import Post
+from profiling.models import RequestProfile
+
+POST_URL = reverse("posts:post_list-list")
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT, PROFILER_INTERVAL=0.0001
+)
+class ProfilerMiddlewareTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PRIVATE_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.staff = get_user_model().objects.create_superuser(
+            "admin@test.com",
+            "testpass",
+        )
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        Post.objects.create(title="title", content="text", owner=self.user)
+
+    def client_for(self, user) -> APIClient:
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_staff_request_is_sampled(self):
+        res = self.client_for(self.staff).get(POST_URL, {"profile": "1"})
+
+        profile = RequestProfile.objects.get(pk=res.headers["X-Profile-Id"])
+        self.assertEqual(profile.mode, RequestProfile.Mode.SAMPLE)
+        self.assertEqual(profile.path, f"{POST_URL}?profile=1")
+        self.assertEqual(profile.status_code, 200)
+        self.assertIn("samples, one every 0.1 ms", profile.table)
+        self.assertTrue(profile.stacks.name.endswith(".collapsed.txt"))
+        with profile.stacks.open("rb") as stacks:
+            for line in stacks.read().decode().splitlines():
+                stack, count = line.rsplit(" ", 1)
+                self.assertGreater(int(count), 0)
+
+    def test_staff_request_is_profiled_with_cprofile(self):
+        res = self.client_for(self.staff).get(
+            POST_URL, HTTP_X_PROFILE="cprofile"
+        )
+
+        profile = RequestProfile.objects.get(pk=res.headers["X-Profile-Id"])
+        self.assertIn("cumulative", profile.table)
+        stats = pstats.Stats(
+            os.path.join(PRIVATE_MEDIA_ROOT, profile.stacks.name)
+        )
+        self.assertGreater(stats.total_calls, 0)
+
+    def test_flag_is_ignored_for_other_users(self):
+        res = self.client_for(self.user).get(POST_URL, {"profile": "1"})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("X-Profile-Id", res.headers)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILER_SAMPLE_RATE=0)
+    def test_flagged_requests_are_sampled_at_the_rate(self):
+        res = self.client_for(self.staff).get(POST_URL, {"profile": "1"})
+
+        self.assertNotIn("X-Profile-Id", res.headers)
+
+    def test_profiles_are_listed_in_the_admin(self):
+        res = self.client_for(self.staff).get(POST_URL, {"profile": "1"})
+        self.client.force_login(self.staff)
+
+        listing = self.client.get(
+            reverse("admin:profiling_requestprofile_changelist")
+        )
+        detail = self.client.get(
+            reverse(
+                "admin:profiling_requestprofile_change",
+                args=[res.headers["X-Profile-Id"]],
+            )
+        )
+        self.assertContains(listing, POST_URL)
+        self.assertContains(detail, "samples, one every")
+
+    def test_stacks_are_only_downloadable_by_staff(self):
+        res = self.client_for(self.staff).get(POST_URL, {"profile": "1"})
+        profile = RequestProfile.objects.get(pk=res.headers["X-Profile-Id"])
+        url = reverse(
+            "admin:profiling_requestprofile_stacks", args=[profile.pk]
+        )
+        self.assertRegex(
+            profile.stacks.name, r"^request-profiles/[0-9a-f]{32}\."
+        )
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        download = self.client.get(url)
+        with profile.stacks.open("rb") as stacks:
+            self.assertEqual(
+                b"".join(download.streaming_content), stacks.read()
+            )
@@ -0,0 +1,364 @@
+"""
+In-process endpoint benchmarks with query-count and latency budgets.
+
+A dataset is seeded with ``generate_social_data`` plus a viewer who
+follows a given number of users, then every scenario is driven through
+``APIClient``: ``warmup`` untimed requests, then ``repeat`` timed ones
+with the garbage collector off and the cache cleared before each
+request, so the uncached path is what gets measured. For every scenario
+the SQL query count, interpolated p50/p95 latency and the peak of Python
+allocations are recorded and compared to a checked-in baseline: the
+query count must not grow, latency and allocations may grow by the given
+tolerance.
+
+Not covered: ``comments/create/``, which takes no post (``add-comment``
+creates comments), profile image uploads and export downloads, which
+write or stream files, the token refresh and verify endpoints, and the
+schema and documentation pages.
+"""
+import gc
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from profiles.models import Profile
+
+POSTS_URL = "/api/social-media/posts/"
+PROFILES_URL = "/api/social-media/profiles/"
+COMMENTS_URL = "/api/social-media/comments/"
+USERS_URL = "/api/social-media/user/"
+METRICS_URL = "/api/metrics/"
+VIEWER_EMAIL = "benchmark-viewer@example.com"
+VIEWER_PASSWORD = "benchmark"
+METRICS_TOKEN = "benchmark"
+# Users without a profile, one per profile-create request
+NEWCOMERS = 100
+WARMUP = 5
+# Below this, p95 differences are timer and GC noise rather than regressions
+LATENCY_SLACK_MS = 5.0
+
+
+class DatasetSize(NamedTuple):
+    users: int
+    posts: int
+    comments: int
+    reactions: int
+    followings: int
+
+
+DATASETS = {
+    "small": DatasetSize(
+        users=1000, posts=1000, comments=2000, reactions=5000, followings=10
+    ),
+    "large": DatasetSize(
+        users=10_050,
+        posts=100_000,
+        comments=100_000,
+        reactions=200_000,
+        followings=10_000,
+    ),
+}
+
+
+@dataclass
+class Dataset:
+    viewer: object
+    posts: list[int]
+    profiles: list[int]
+    newcomers: list[object]
+
+
+@dataclass
+class Result:
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    peak_kb: float
+
+
+Scenario = Callable[[APIClient, Dataset, int], object]
+
+
+def _as_newcomer(data: Dataset, index: int) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(data.newcomers[index])
+    return client
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "posts-list": lambda c, d, i: c.get(f"{POSTS_URL}list/"),
+    "posts-list-filtered": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/", {"title": "api", "since": "2023-01-01"}
+    ),
+    "post-detail": lambda c, d, i: c.get(f"{POSTS_URL}list/{d.posts[0]}/"),
+    "post-comments": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/{d.posts[0]}/comments/", {"order": "newest"}
+    ),
+    "post-likes": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/{d.posts[0]}/likes/"
+    ),
+    "my-posts": lambda c, d, i: c.get(f"{POSTS_URL}list/my-posts/"),
+    "followings-posts": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/followings-posts/"
+    ),
+    "search": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/search/", {"q": "redis cache"}
+    ),
+    "comments-list": lambda c, d, i: c.get(f"{COMMENTS_URL}list/"),
+    "profiles-list": lambda c, d, i: c.get(f"{PROFILES_URL}list/"),
+    "profile-detail": lambda c, d, i: c.get(
+        f"{PROFILES_URL}list/{d.profiles[0]}/"
+    ),
+    "post-dislikes": lambda c, d, i: c.get(
+        f"{POSTS_URL}list/{d.posts[0]}/dislikes/"
+    ),
+    "create-post": lambda c, d, i: c.post(
+        f"{POSTS_URL}create/", {"title": f"bench {i}", "content": "x"}
+    ),
+    "create-posts-bulk": lambda c, d, i: c.post(
+        f"{POSTS_URL}create/bulk/",
+        [{"title": f"bench {i} {j}", "content": "x"} for j in range(20)],
+        format="json",
+    ),
+    "add-comment": lambda c, d, i: c.post(
+        f"{POSTS_URL}list/{d.posts[i]}/add-comment/", {"content": "x"}
+    ),
+    "like": lambda c, d, i: c.post(f"{POSTS_URL}list/{d.posts[i]}/like/"),
+    "clear-reaction": lambda c, d, i: c.delete(
+        f"{POSTS_URL}list/{d.posts[i]}/clear-reaction/"
+    ),
+    "dislike": lambda c, d, i: c.post(
+        f"{POSTS_URL}list/{d.posts[i]}/dislike/"
+    ),
+    "follow": lambda c, d, i: c.get(
+        f"{PROFILES_URL}list/{d.profiles[-1 - i]}/follow/"
+    ),
+    "unfollow": lambda c, d, i: c.get(
+        f"{PROFILES_URL}list/{d.profiles[-1 - i]}/unfollow/"
+    ),
+    "my-profile": lambda c, d, i: c.get(f"{PROFILES_URL}me/"),
+    "update-profile": lambda c, d, i: c.patch(
+        f"{PROFILES_URL}me/update/", {"bio": f"bench {i}"}
+    ),
+    "create-profile": lambda c, d, i: _as_newcomer(d, i).post(
+        f"{PROFILES_URL}create/", {"username": f"newcomer{i}"}
+    ),
+    "register": lambda c, d, i: c.post(
+        f"{USERS_URL}register/",
+        {"email": f"bench-{i}@example.com", "password": "benchmark"},
+    ),
+    "token": lambda c, d, i: c.post(
+        f"{USERS_URL}token/",
+        {"email": VIEWER_EMAIL, "password": VIEWER_PASSWORD},
+    ),
+    "request-export": lambda c, d, i: c.post(f"{USERS_URL}exports/"),
+    "exports-list": lambda c, d, i: c.get(f"{USERS_URL}exports/"),
+    "metrics": lambda c, d, i: c.get(
+        METRICS_URL, HTTP_AUTHORIZATION=f"Bearer {METRICS_TOKEN}"
+    ),
+}
+
+
+def seed_dataset(size: DatasetSize, seed: int = 42) -> Dataset:
+    """Generate a dataset and a viewer following ``size.followings``"""
+    call_command(
+        "generate_social_data",
+        users=size.users,
+        posts=size.posts,
+        comments=size.comments,
+        reactions=size.reactions,
+        seed=seed,
+        stdout=io.StringIO(),
+    )
+    viewer = get_user_model().objects.create_user(
+        VIEWER_EMAIL, VIEWER_PASSWORD
+    )
+    profile = Profile.objects.create(user=viewer, username="benchmark")
+    followed = list(
+        get_user_model()
+        .objects.exclude(pk=viewer.pk)
+        .order_by("pk")
+        .values_list("pk", flat=True)[: size.followings]
+    )
+    following = Profile.following.through
+    following.objects.bulk_create(
+        following(profile_id=profile.pk, user_id=user_id)
+        for user_id in followed
+    )
+    followers = Profile.followers.through
+    followers.objects.bulk_create(
+        followers(profile_id=profile_id, user_id=viewer.pk)
+        for profile_id in Profile.objects.filter(
+            user_id__in=followed
+        ).values_list("pk", flat=True)
+    )
+    Post.objects.bulk_create(
+        Post(title=f"viewer post {index}", content="x", owner=viewer)
+        for index in range(20)
+    )
+    newcomers = get_user_model().objects.bulk_create(
+        get_user_model()(email=f"newcomer-{index}@example.com")
+        for index in range(NEWCOMERS)
+    )
+    return Dataset(
+        viewer=viewer,
+        newcomers=newcomers,
+        posts=list(
+            Post.objects.order_by("-likes_count", "id").values_list(
+                "pk", flat=True
+            )[:1000]
+        ),
+        profiles=list(
+            Profile.objects.exclude(user=viewer)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:1000]
+        ),
+    )
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Linearly interpolated percentile, so p95 is not just the maximum"""
+    ordered = sorted(samples)
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def _request(
+    scenario: Scenario, client: APIClient, data: Dataset, index: int
+):
+    response = scenario(client, data, index)
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{response.request['PATH_INFO']}: {response.status_code} "
+            f"{response.content[:200]}"
+        )
+    return response
+
+
+def measure(
+    scenario: Scenario,
+    client: APIClient,
+    data: Dataset,
+    repeat: int,
+    warmup: int = WARMUP,
+) -> Result:
+    """
+    Run ``scenario`` ``warmup`` times untimed, ``repeat`` times timed,
+    then once more under tracemalloc
+    """
+    for index in range(warmup):
+        cache.clear()
+        _request(scenario, client, data, index)
+    timings = []
+    queries = 0
+    gc.collect()
+    gc.disable()
+    try:
+        for index in range(warmup, warmup + repeat):
+            cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                _request(scenario, client, data, index)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, len(captured))
+    finally:
+        gc.enable()
+    cache.clear()
+    tracemalloc.start()
+    try:
+        scenario(client, data, warmup + repeat)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(
+        queries=queries,
+        p50_ms=round(percentile(timings, 0.5), 2),
+        p95_ms=round(percentile(timings, 0.95), 2),
+        peak_kb=round(peak / 1024, 1),
+    )
+
+
+def run_scenarios(
+    data: Dataset,
+    repeat: int,
+    names: Optional[list[str]] = None,
+    warmup: int = WARMUP,
+) -> dict[str, Result]:
+    client = APIClient()
+    client.force_authenticate(data.viewer)
+    # Export archives go to a throwaway directory
+    with tempfile.TemporaryDirectory() as private_root:
+        with override_settings(
+            METRICS_TOKEN=METRICS_TOKEN, PRIVATE_MEDIA_ROOT=private_root
+        ):
+            return {
+                name: measure(SCENARIOS[name], client, data, repeat, warmup)
+                for name in names or SCENARIOS
+            }
+
+
+def load_baseline(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, Result]]) -> None:
+    """Replace the budgets of the datasets in ``results``, keep the rest"""
+    data = load_baseline(path)
+    data.update(
+        (dataset, {name: asdict(result) for name, result in scenarios.items()})
+        for dataset, scenarios in results.items()
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as baseline:
+        json.dump(data, baseline, indent=2, sort_keys=True)
+        baseline.write("\n")
+
+
+def regressions(
+    results: dict[str, Result],
+    baseline: dict[str, dict],
+    tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    """Budgets of ``baseline`` that ``results`` exceed"""
+    failures = []
+    for name, result in results.items():
+        budget = baseline.get(name)
+        if budget is None:
+            continue
+        if result.queries > budget["queries"]:
+            failures.append(
+                f"{name}: {result.queries} queries, budget {budget['queries']}"
+            )
+        allowed = budget["p95_ms"] * (1 + tolerance) + LATENCY_SLACK_MS
+        if result.p95_ms > allowed:
+            failures.append(
+                f"{name}: p95 {result.p95_ms}ms, baseline {budget['p95_ms']}ms"
+            )
+        if result.peak_kb > budget["peak_kb"] * (1 + memory_tolerance):
+            failures.append(
+                f"{name}: peak {result.peak_kb}KiB, "
+                f"baseline {budget['peak_kb']}KiB"
+            )
+    return failures
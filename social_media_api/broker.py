@@ -0,0 +1,168 @@
+"""
+Shared Redis connection pool and a cached broker health check.
+
+Request handlers must not pay a network round trip, let alone a connect
+timeout, to learn whether the worker's broker is up. A daemon thread per
+process pings Redis every BROKER_HEALTH_INTERVAL seconds through the
+shared pool and keeps the result in memory behind a circuit breaker:
+once the broker is down it is only probed again after an exponentially
+growing cool-down, and callers that hit a broker error themselves trip
+the breaker at once with ``record_failure()``.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[redis.ConnectionPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> redis.ConnectionPool:
+    """Process-wide pool for REDIS_URL, recreated after a fork"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            timeout = getattr(settings, "BROKER_HEALTH_TIMEOUT", 0.5)
+            _pool = redis.ConnectionPool.from_url(
+                getattr(settings, "REDIS_URL", "redis://localhost:6379"),
+                socket_connect_timeout=timeout,
+                socket_timeout=timeout,
+                health_check_interval=30,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def get_redis() -> redis.Redis:
+    return redis.Redis(connection_pool=get_connection_pool())
+
+
+def ping_redis() -> bool:
+    try:
+        return bool(get_redis().ping())
+    except redis.exceptions.RedisError:
+        return False
+
+
+class BrokerHealthMonitor:
+    """
+    Circuit breaker over a ``ping`` callable. ``check()`` runs one probe
+    if one is due; ``start()`` runs it in a daemon thread forever.
+    ``available`` never does any I/O.
+    """
+
+    def __init__(
+        self,
+        ping: Callable[[], bool] = ping_redis,
+        interval: float = 5.0,
+        failure_threshold: int = 2,
+        max_cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ping = ping
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.available = False
+        self.failures = 0
+        self.cooldown = interval
+        self.next_probe = 0.0
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.failure_threshold
+
+    def check(self) -> bool:
+        """Probe the broker if the breaker allows it, return the state"""
+        if self.clock() < self.next_probe:
+            return self.available
+        if self.ping():
+            self.record_success()
+        else:
+            self.record_failure(tripped=False)
+        return self.available
+
+    def record_success(self) -> None:
+        with self.lock:
+            if self.is_open:
+                logger.info("Broker is reachable again")
+            self.failures = 0
+            self.cooldown = self.interval
+            self.available = True
+            self.next_probe = self.clock() + self.interval
+
+    def record_failure(self, tripped: bool = True) -> None:
+        """
+        Count a failed probe; ``tripped`` failures reported by callers
+        open the breaker at once.
+        """
+        with self.lock:
+            was_open = self.is_open
+            self.failures = (
+                max(self.failures + 1, self.failure_threshold)
+                if tripped
+                else self.failures + 1
+            )
+            if not self.is_open:
+                self.next_probe = self.clock() + self.interval
+                return
+            if was_open:
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            else:
+                logger.warning("Broker is unreachable, writing directly")
+            self.available = False
+            self.next_probe = self.clock() + self.cooldown
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.check()
+            except Exception:  # keep monitoring whatever happens
+                logger.exception("Broker health check failed")
+            time.sleep(min(self.interval, 1.0))
+
+    @property
+    def running(self) -> bool:
+        return bool(
+            self.pid == os.getpid() and self.thread and self.thread.is_alive()
+        )
+
+    def start(self) -> None:
+        """Start the monitor thread of this process if it is not running"""
+        if self.running:
+            return
+        with self.lock:
+            if self.running:
+                return
+            self.pid = os.getpid()
+            self.thread = threading.Thread(
+                target=self.run, name="broker-health", daemon=True
+            )
+            self.thread.start()
+
+
+monitor = BrokerHealthMonitor(
+    interval=getattr(settings, "BROKER_HEALTH_INTERVAL", 5.0)
+)
+
+
+def is_broker_available() -> bool:
+    """Last known broker state; False until the first probe succeeds"""
+    monitor.start()
+    return monitor.available
+
+
+def record_failure() -> None:
+    monitor.record_failure()
@@ -16,6 +16,9 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Record task run times through the task_prerun/task_postrun signals
+import social_media_api.metrics  # noqa: E402,F401
+
 
 @app.task(bind=True)
 def debug_task(self):
@@ -0,0 +1,93 @@
+"""
+Conditional GET for DRF viewsets.
+
+Validators come from cheap sources only: the ``updated_at`` column of a
+single object, or the generation counter of a whole collection. When
+they match the client's If-None-Match / If-Modified-Since headers the
+view answers 304 Not Modified without running its serializers.
+"""
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Optional
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from social_media_api.generations import get_generation
+
+Validators = tuple[Optional[str], Optional[datetime]]
+
+
+def conditional(validators: str) -> Callable:
+    """
+    Decorate a viewset handler so it honours conditional GET requests.
+    ``validators`` names the view method returning (etag, last_modified).
+    """
+    def decorator(handler: Callable) -> Callable:
+        @wraps(handler)
+        def wrapper(self, request: Request, *args, **kwargs):
+            etag, last_modified = getattr(self, validators)()
+            timestamp = last_modified and int(last_modified.timestamp())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = handler(self, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                if etag:
+                    response.headers["ETag"] = etag
+                if timestamp:
+                    response.headers["Last-Modified"] = http_date(timestamp)
+                response.headers["Cache-Control"] = "private, no-cache"
+                patch_vary_headers(response, ["Authorization"])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    Conditional list and retrieve for viewsets. ``generation_resource``
+    names the generation counter bumped by every write to the collection.
+    """
+
+    generation_resource: str
+
+    def collection_validators(self) -> Validators:
+        """ETag of the collection page requested by the current user"""
+        request = self.request
+        query = sorted(request.query_params.lists())
+        key = (
+            f"{get_generation(self.generation_resource)}|{request.path}|"
+            f"{query}|{request.user.pk}"
+        )
+        digest = hashlib.md5(key.encode(), usedforsecurity=False)
+        return "W/" + quote_etag(digest.hexdigest()), None
+
+    def object_validators(self) -> Validators:
+        """ETag and Last-Modified of the object from its updated_at column"""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        updated_at = (
+            self.get_queryset()
+            .prefetch_related(None)
+            .filter(**{self.lookup_field: lookup})
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None, None
+        version = int(updated_at.timestamp() * 1_000_000)
+        return "W/" + quote_etag(f"{lookup}-{version}"), updated_at
+
+    @conditional("collection_validators")
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return super().list(request, *args, **kwargs)
+
+    @conditional("object_validators")
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,57 @@
+"""
+Per-resource generation counters.
+
+Every write to a resource ("posts", "profiles") bumps its counter, so
+anything derived from a whole collection (list ETags, cached list pages)
+is invalidated in O(1) by folding the generation into its key. Counters
+live in the default cache; a missing counter is seeded with the current
+time in microseconds so it never goes back to a value that was already
+handed out before it was evicted.
+
+A bump inside a transaction is repeated when it commits, otherwise a
+reader could cache the pre-commit state under the bumped generation.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+KEY_PREFIX = "generation"
+
+
+def _key(resource: str) -> str:
+    return f"{KEY_PREFIX}:{resource}"
+
+
+def _seed() -> int:
+    return time.time_ns() // 1000
+
+
+def get_generations(*resources: str) -> dict[str, int]:
+    keys = {_key(resource): resource for resource in resources}
+    found = cache.get_many(keys)
+    generations = {keys[key]: value for key, value in found.items()}
+    for key, resource in keys.items():
+        if resource not in generations:
+            cache.add(key, _seed(), timeout=None)
+            generations[resource] = cache.get(key, _seed())
+    return generations
+
+
+def get_generation(resource: str) -> int:
+    return get_generations(resource)[resource]
+
+
+def bump_generation(*resources: str) -> None:
+    _bump(resources)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(resources))
+
+
+def _bump(resources: tuple[str, ...]) -> None:
+    for resource in resources:
+        key = _key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _seed(), timeout=None)
@@ -0,0 +1,470 @@
+"""
+In-process metrics with a Prometheus text scrape endpoint.
+
+Every thread adds to its own dict of samples, so recording a value takes
+no lock; a scrape sums the dicts of all threads. The dicts of finished
+threads are folded into one retired dict. With METRICS_DIR set each
+process also writes its samples to ``<METRICS_DIR>/<pid>.json`` every
+METRICS_FLUSH_INTERVAL seconds, and a scrape sums the files of all
+processes, so any gunicorn or Celery worker answers for all of them.
+A scrape merges the files of exited workers into ``retired.json``, so
+counters never go backwards and the directory stays bounded.
+
+Requests to the METRICS_APPS views are recorded by ``MetricsMiddleware``,
+Celery tasks by the ``task_prerun``/``task_postrun`` signal handlers.
+The endpoint answers staff users and scrapers sending METRICS_TOKEN as
+a bearer token.
+"""
+import bisect
+import fcntl
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0, 1800.0)
+
+Labels = tuple[tuple[str, str], ...]
+Key = tuple[str, Labels]
+
+
+class Registry:
+    """Metric definitions and the per-thread samples of this process"""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, "Metric"] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Start empty, also after a fork: the samples are the parent's"""
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.shards: dict[threading.Thread, dict[Key, float]] = {}
+        self.retired: dict[Key, float] = {}
+        self.flusher_pid: Optional[int] = None
+
+    def register(self, metric: "Metric") -> "Metric":
+        self.metrics[metric.name] = metric
+        return metric
+
+    def shard(self) -> dict[Key, float]:
+        try:
+            return self.local.samples
+        except AttributeError:
+            pass
+        samples: dict[Key, float] = {}
+        with self.lock:
+            self.retire_finished()
+            self.shards[threading.current_thread()] = samples
+        self.local.samples = samples
+        self.start_flusher()
+        return samples
+
+    def retire_finished(self) -> None:
+        """Fold the shards of finished threads into the retired one"""
+        for thread in [t for t in self.shards if not t.is_alive()]:
+            for key, value in self.shards.pop(thread).items():
+                self.retired[key] = self.retired.get(key, 0.0) + value
+
+    def add(self, key: Key, amount: float) -> None:
+        samples = self.shard()
+        samples[key] = samples.get(key, 0.0) + amount
+
+    def samples(self) -> dict[Key, float]:
+        """Samples of every thread of this process"""
+        with self.lock:
+            self.retire_finished()
+            shards = [self.retired.copy(), *self.shards.values()]
+        total: dict[Key, float] = {}
+        for shard in shards:
+            for key, value in shard.copy().items():
+                total[key] = total.get(key, 0.0) + value
+        return total
+
+    def start_flusher(self) -> None:
+        if get_metrics_dir() is None or self.flusher_pid == os.getpid():
+            return
+        self.flusher_pid = os.getpid()
+        threading.Thread(
+            target=self.flush_forever, name="metrics-flusher", daemon=True
+        ).start()
+
+    def flush_forever(self) -> None:
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0)
+        pid = os.getpid()
+        while self.flusher_pid == pid:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Could not write metrics")
+
+    def flush(self) -> None:
+        """Write the samples of this process to METRICS_DIR"""
+        directory = get_metrics_dir()
+        if directory is None:
+            return
+        path = directory / f"{os.getpid()}.json"
+        # A unique name per writer: a scrape and the flusher thread may
+        # flush at the same time
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".part", delete=False
+        ) as file:
+            try:
+                json.dump(
+                    [
+                        [name, list(labels), value]
+                        for (name, labels), value in self.samples().items()
+                    ],
+                    file,
+                )
+            except BaseException:
+                file.close()
+                os.remove(file.name)
+                raise
+        os.replace(file.name, path)
+
+    def collect(self) -> dict[Key, float]:
+        """Samples of every process sharing METRICS_DIR, or of this one"""
+        directory = get_metrics_dir()
+        if directory is None:
+            return self.samples()
+        self.flush()
+        try:
+            retire_exited(directory)
+        except OSError:
+            logger.exception("Could not merge metrics of exited workers")
+        total: dict[Key, float] = {}
+        for path in directory.glob("*.json"):
+            _add_rows(total, _read_rows(path))
+        return total
+
+
+def get_metrics_dir() -> Optional[Path]:
+    directory = getattr(settings, "METRICS_DIR", None)
+    return Path(directory) if directory else None
+
+
+def _read_rows(path: Path) -> list:
+    try:
+        with open(path) as file:
+            rows = json.load(file)
+    except (OSError, ValueError):
+        return []
+    return rows["rows"] if isinstance(rows, dict) else rows
+
+
+def _add_rows(total: dict[Key, float], rows: list) -> None:
+    for name, labels, value in rows:
+        key = (name, tuple(tuple(label) for label in labels))
+        total[key] = total.get(key, 0.0) + value
+
+
+def _has_exited(path: Path) -> bool:
+    """
+    Whether the worker that wrote ``<pid>.json`` is gone. Live workers
+    rewrite their file every flush interval, so a recent file is kept
+    even when the pid is not found, e.g. in another container.
+    """
+    try:
+        pid = int(path.stem)
+    except ValueError:
+        return False
+    stale = 10 * getattr(settings, "METRICS_FLUSH_INTERVAL", 5.0)
+    if pid == os.getpid() or time.time() - path.stat().st_mtime < stale:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def retire_exited(directory: Path) -> None:
+    """Merge the files of exited workers into ``retired.json``"""
+    retired = directory / "retired.json"
+    with open(directory / "retired.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(retired) as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            state = {"merged": [], "rows": []}
+        merged = set(state["merged"])
+        exited = []
+        for path in directory.glob("*.json"):
+            if path == retired or not _has_exited(path):
+                continue
+            if path.name in merged:
+                # Merged by a scrape that died before removing it
+                path.unlink()
+            else:
+                exited.append(path)
+        if not exited and not merged:
+            return
+        total: dict[Key, float] = {}
+        _add_rows(total, state["rows"])
+        for path in exited:
+            _add_rows(total, _read_rows(path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".part", delete=False
+        ) as file:
+            json.dump(
+                {
+                    "merged": [path.name for path in exited],
+                    "rows": [
+                        [name, list(labels), value]
+                        for (name, labels), value in total.items()
+                    ],
+                },
+                file,
+            )
+        os.replace(file.name, retired)
+        for path in exited:
+            path.unlink(missing_ok=True)
+
+
+registry = Registry()
+os.register_at_fork(after_in_child=registry.reset)
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        registry.register(self)
+
+    def expose(self, samples: dict[Key, float]) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        registry.add((self.name, _labels(labels)), amount)
+
+    def expose(self, samples: dict[Key, float]) -> list[str]:
+        lines = super().expose(samples)
+        for (name, labels), value in sorted(samples.items()):
+            if name == self.name:
+                lines.append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return lines
+
+
+class Histogram(Metric):
+    """Counts per fixed bucket; bucket samples are stored non-cumulative"""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple[float, ...]
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        self.bounds = [_format_value(bound) for bound in self.buckets]
+        self.bounds.append("+Inf")
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels(labels)
+        bound = self.bounds[bisect.bisect_left(self.buckets, value)]
+        registry.add((f"{self.name}_bucket", key + (("le", bound),)), 1)
+        registry.add((f"{self.name}_sum", key), value)
+        registry.add((f"{self.name}_count", key), 1)
+
+    def expose(self, samples: dict[Key, float]) -> list[str]:
+        lines = super().expose(samples)
+        series = sorted(
+            labels for name, labels in samples if name == f"{self.name}_count"
+        )
+        for labels in series:
+            cumulative = 0.0
+            for bound in self.bounds:
+                cumulative += samples.get(
+                    (f"{self.name}_bucket", labels + (("le", bound),)), 0
+                )
+                lines.append(
+                    f"{self.name}_bucket"
+                    f"{_format_labels(labels + (('le', bound),))} "
+                    f"{_format_value(cumulative)}"
+                )
+            for suffix in ("sum", "count"):
+                value = samples[(f"{self.name}_{suffix}", labels)]
+                lines.append(
+                    f"{self.name}_{suffix}{_format_labels(labels)} "
+                    f"{_format_value(value)}"
+                )
+        return lines
+
+
+requests_total = Counter(
+    "http_requests_total", "Requests answered, per view and status"
+)
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to answer a request, per view",
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "http_request_queries", "SQL queries run per request", QUERY_BUCKETS
+)
+request_sql_duration = Histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent in SQL per request",
+    LATENCY_BUCKETS,
+)
+response_cache_requests = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups, per resource and outcome",
+)
+tasks_total = Counter(
+    "celery_tasks_total", "Celery tasks run, per task and state"
+)
+task_duration = Histogram(
+    "celery_task_duration_seconds", "Celery task run time", TASK_BUCKETS
+)
+
+
+def render_metrics() -> str:
+    samples = registry.collect()
+    lines = []
+    for metric in registry.metrics.values():
+        lines.extend(metric.expose(samples))
+    return "\n".join(lines) + "\n"
+
+
+def is_scraper(request: HttpRequest) -> bool:
+    """The request carries METRICS_TOKEN or comes from a staff user"""
+    token = getattr(settings, "METRICS_TOKEN", None)
+    authorization = request.META.get("HTTP_AUTHORIZATION", "")
+    if token and hmac.compare_digest(
+        authorization.encode(), f"Bearer {token}".encode()
+    ):
+        return True
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        user = authenticated[0] if authenticated else None
+    return user is not None and user.is_staff
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Prometheus text exposition of every metric"""
+    if not is_scraper(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4"
+    )
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - started
+
+
+class MetricsMiddleware:
+    """Rate, latency and queries of the views of METRICS_APPS"""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.apps = set(
+            getattr(
+                settings,
+                "METRICS_APPS",
+                ("posts", "profiles", "comments", "users"),
+            )
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connections["default"].execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        if match is None or match.namespace not in self.apps:
+            return response
+        view = f"{match.namespace}:{match.url_name}"
+        requests_total.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        request_duration.observe(duration, view=view)
+        request_queries.observe(counter.queries, view=view)
+        request_sql_duration.observe(counter.seconds, view=view)
+        return response
+
+
+_task_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs) -> None:
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    tasks_total.inc(task=task.name, state=state)
+    task_duration.observe(time.perf_counter() - started, task=task.name)
@@ -0,0 +1,242 @@
+import json
+from base64 import b64decode, b64encode
+from datetime import datetime
+from typing import Any, Optional
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Model, Q, QuerySet
+from django.utils.encoding import force_str
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination that seeks by the values of the last row
+    instead of counting an OFFSET, so every page costs one index range
+    scan no matter how deep it is. The last field of ``ordering`` must be
+    unique to make the position of every row unambiguous.
+    """
+
+    ordering: tuple[str, ...] = ("-id",)
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+
+        reverse = bool(self.cursor and self.cursor["reverse"])
+        ordering = self.get_ordering(reverse)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            queryset = queryset.filter(
+                self.seek_filter(ordering, self.cursor["position"])
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, reverse: bool = False) -> list[str]:
+        if not reverse:
+            return list(self.ordering)
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    @staticmethod
+    def seek_filter(ordering: list[str], position: list) -> Q:
+        """Rows strictly after ``position`` in ``ordering``"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position, strict=True):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_position(self, item: Any) -> list:
+        position = []
+        for field in self.ordering:
+            value = getattr(item, field.lstrip("-"))
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def decode_cursor(
+        self, request: Request, model: type[Model]
+    ) -> Optional[dict]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode("ascii")))
+            position = cursor["p"]
+            reverse = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = self.parse_position(model, position)
+        except (DjangoValidationError, TypeError, ValueError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+        return {"position": position, "reverse": reverse}
+
+    def parse_position(self, model: type[Model], position: list) -> list:
+        """Convert the cursor values with the fields of ``ordering``"""
+        values = []
+        for field, value in zip(self.ordering, position, strict=True):
+            if value is None or isinstance(value, (dict, list)):
+                raise TypeError(f"Invalid {field} in cursor")
+            model_field = model._meta.get_field(field.lstrip("-"))
+            values.append(model_field.to_python(value))
+        return values
+
+    def encode_cursor(self, position: list, reverse: bool = False) -> str:
+        cursor = {"p": position}
+        if reverse:
+            cursor["r"] = 1
+        return force_str(
+            b64encode(json.dumps(cursor, separators=(",", ":")).encode())
+        )
+
+    def build_link(self, position: list, reverse: bool = False) -> str:
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(position, reverse)
+        )
+
+    def get_link_after(self, url: str, item: Any) -> str:
+        """Link to the page of ``url`` that starts right after ``item``"""
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(self.get_position(item)),
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.get_position(self.page[-1]))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.build_link(
+            self.get_position(self.page[0]), reverse=True
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page "
+                               f"(max {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class PostPagination(KeysetPagination):
+    ordering = ("-created_time", "-id")
+
+
+class ProfilePagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class CommentaryPagination(KeysetPagination):
+    """Comments oldest first, or newest first with ``?order=newest``"""
+
+    ordering = ("created_time", "id")
+    order_query_param = "order"
+    orderings = {
+        "oldest": ("created_time", "id"),
+        "newest": ("-created_time", "-id"),
+    }
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list:
+        order = request.query_params.get(self.order_query_param, "oldest")
+        if order not in self.orderings:
+            raise ValidationError(
+                {self.order_query_param: f"Use one of {list(self.orderings)}"}
+            )
+        self.ordering = self.orderings[order]
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_schema_operation_parameters(self, view) -> list[dict]:
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.order_query_param,
+                "required": False,
+                "in": "query",
+                "description": "oldest (default) or newest first.",
+                "schema": {"type": "string", "enum": list(self.orderings)},
+            },
+        ]
+
+
+class ReactionPagination(KeysetPagination):
+    ordering = ("id",)
@@ -0,0 +1,20 @@
+"""
+Opt-in redirects after write actions.
+
+Like, dislike, follow and unfollow used to answer with a redirect to the
+full list, which clients followed after every click. They now return
+their new state as JSON; ACTION_REDIRECTS = True restores the redirect
+for clients that still depend on it.
+"""
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+
+
+def legacy_redirect(viewname: str) -> Optional[HttpResponseRedirect]:
+    """Redirect to ``viewname`` if ACTION_REDIRECTS is on, else None"""
+    if not getattr(settings, "ACTION_REDIRECTS", False):
+        return None
+    return HttpResponseRedirect(reverse(viewname))
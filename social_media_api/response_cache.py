@@ -0,0 +1,84 @@
+"""
+Versioned response cache for list endpoints.
+
+A cached page is keyed by the generation of its resource and the
+normalized URL it was requested with, so one ``bump_generation`` call
+after a write makes every cached page of the resource unreachable
+without scanning or deleting keys; stale entries simply expire.
+Hits and misses are counted per resource by the
+``response_cache_requests_total`` metric.
+"""
+import hashlib
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from social_media_api.generations import get_generation
+from social_media_api.metrics import response_cache_requests
+
+KEY_PREFIX = "response"
+
+
+def get_cache_timeout() -> int:
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+def normalize_query(request: Request) -> str:
+    """Query string with blank values dropped and parameters sorted"""
+    return urlencode(
+        sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+            if value.strip()
+        )
+    )
+
+
+class ResponseCacheMixin:
+    """
+    Cache the data of successful list responses. ``generation_resource``
+    names the generation counter bumped by every write to the collection;
+    views whose responses depend on who is asking set ``cache_per_user``.
+    """
+
+    generation_resource: str
+    cache_per_user = False
+
+    def response_cache_key(self) -> str:
+        request = self.request
+        url = f"{request.build_absolute_uri(request.path)}?" + (
+            normalize_query(request)
+        )
+        if self.cache_per_user:
+            url += f"|{request.user.pk}"
+        digest = hashlib.md5(url.encode(), usedforsecurity=False)
+        return (
+            f"{KEY_PREFIX}:{self.generation_resource}:"
+            f"{get_generation(self.generation_resource)}:"
+            f"{digest.hexdigest()}"
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        key = self.response_cache_key()
+        data: Optional[dict] = cache.get(key)
+        if data is not None:
+            response_cache_requests.inc(
+                resource=self.generation_resource, outcome="hits"
+            )
+            response = Response(data)
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        response_cache_requests.inc(
+            resource=self.generation_resource, outcome="misses"
+        )
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, get_cache_timeout())
+        response.headers["X-Cache"] = "MISS"
+        return response
@@ -52,15 +52,19 @@ INSTALLED_APPS = [
     "posts",
     "comments",
     "likes",
+    "profiling",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "social_media_api.timing.ServerTimingMiddleware",
+    "social_media_api.metrics.MetricsMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "profiling.middleware.ProfilerMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -96,6 +100,30 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Generation counters behind ETags and cached list pages must be shared by
+# every worker process, so production should point CACHE_URL at Redis.
+
+CACHE_URL = os.getenv("CACHE_URL")
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a cached list page may be served; writes invalidate it earlier
+RESPONSE_CACHE_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -139,6 +167,8 @@ USE_TZ = True
 STATIC_URL = "static/"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
+# Data exports and request profiles; never served at MEDIA_URL
+PRIVATE_MEDIA_ROOT = BASE_DIR / "private"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -167,6 +197,58 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# Answer like, dislike, follow and unfollow with the old redirect to the
+# full list instead of their new state
+ACTION_REDIRECTS = os.getenv("ACTION_REDIRECTS", "") == "true"
+
+# Share of requests answered with a Server-Timing header and a timing
+# log line, 0 removes the middleware
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "0"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "social_media_api.timing": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
+# Apps whose views are recorded by the metrics middleware. With
+# METRICS_DIR set every process writes its metrics there and a scrape of
+# /api/metrics/ sums all of them. Besides staff users, only scrapers
+# sending "Authorization: Bearer <METRICS_TOKEN>" may read it.
+METRICS_APPS = ("posts", "profiles", "comments", "users")
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 5.0
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Staff requests flagged with an X-Profile header or a ?profile= query
+# are profiled at this rate, the stack sampler looks at the stack every
+# PROFILER_INTERVAL seconds and PROFILER_TOP functions are listed
+PROFILER_SAMPLE_RATE = 1.0
+PROFILER_INTERVAL = 0.001
+PROFILER_TOP = 40
+
+# Number of post ids kept in every materialized home timeline
+TIMELINE_LENGTH = 800
+
+
+# Redis used by the worker; its health is probed in the background
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+BROKER_HEALTH_INTERVAL = 5.0
+BROKER_HEALTH_TIMEOUT = 0.5
+
+# "direct" updates reaction counters on every click, "buffered" sums them
+# in Redis and flushes them every COUNTER_FLUSH_INTERVAL seconds
+COUNTER_WRITE_MODE = os.getenv("COUNTER_WRITE_MODE", "direct")
+COUNTER_FLUSH_INTERVAL = 5.0
 
 # Celery Configuration Options
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
@@ -174,3 +256,33 @@ CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_TIMEZONE = "Europe/Berlin"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "publish-scheduled-posts": {
+        "task": "posts.tasks.publish_scheduled_posts",
+        "schedule": 10.0,
+    },
+    "drain-post-buffer": {
+        "task": "posts.tasks.drain_post_buffer",
+        "schedule": 10.0,
+    },
+    "flush-post-counters": {
+        "task": "posts.tasks.flush_post_counters",
+        "schedule": COUNTER_FLUSH_INTERVAL,
+    },
+    "run-pending-exports": {
+        "task": "users.tasks.run_pending_exports",
+        "schedule": 60.0,
+    },
+}
+
+# "single" sends one create_post message per post, "batch" buffers posts
+# in Redis and inserts them POST_CREATE_BATCH_SIZE at a time
+POST_CREATE_MODE = os.getenv("POST_CREATE_MODE", "single")
+POST_CREATE_BATCH_SIZE = 1000
+
+# Rows fetched per database round trip while writing a data export
+DATA_EXPORT_CHUNK_SIZE = 2000
+
+# Scheduled posts claimed and published per transaction by the publisher
+SCHEDULED_POSTS_BATCH_SIZE = 1000
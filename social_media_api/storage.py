@@ -0,0 +1,31 @@
+"""
+Storage for files only their owners or staff may read.
+
+``PrivateStorage`` keeps files under PRIVATE_MEDIA_ROOT, outside the
+MEDIA_ROOT tree served at MEDIA_URL, and has no URLs: a view checks who
+asks and streams the file with a ``FileResponse``.
+"""
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class PrivateStorage(FileSystemStorage):
+    @property
+    def base_location(self) -> str:
+        return self._value_or_setting(
+            self._location, settings.PRIVATE_MEDIA_ROOT
+        )
+
+    @property
+    def location(self) -> str:
+        return os.path.abspath(self.base_location)
+
+    def url(self, name: str) -> str:
+        raise ValueError("Private files are not served by URL.")
+
+
+private_storage = PrivateStorage()
@@ -0,0 +1,169 @@
+"""
+Per-request Server-Timing instrumentation.
+
+A sampled request gets a ``RequestTiming`` for its duration: every query
+goes through ``connection.execute_wrapper`` and is counted and timed,
+the handler of a view with ``ServerTimingMixin``, where its serializer
+runs, is timed as "view", rendering is timed from
+``process_template_response`` to the end of the handler and any code can
+time its own phase with ``phase(name)``. The
+result is sent as a ``Server-Timing`` header and logged as one line.
+
+Only SERVER_TIMING_SAMPLE_RATE of the requests are instrumented; at 0
+the middleware removes itself at startup, so it costs nothing at all.
+"""
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["RequestTiming"]] = ContextVar(
+    "request_timing", default=None
+)
+
+
+class RequestTiming:
+    """Query count and seconds spent per phase of one request"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.phases: dict[str, float] = {}
+        self.active: set[str] = set()
+        self.view_started: Optional[float] = None
+        self.render_started: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def execute(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add("sql", time.perf_counter() - started)
+
+    def finish(self) -> None:
+        now = time.perf_counter()
+        if self.render_started is not None:
+            self.add("render", now - self.render_started)
+        self.phases["total"] = now - self.started
+
+    def milliseconds(self) -> dict[str, float]:
+        return {
+            name: round(seconds * 1000, 2)
+            for name, seconds in self.phases.items()
+        }
+
+    def header(self) -> str:
+        metrics = []
+        for name, duration in self.milliseconds().items():
+            metric = f"{name};dur={duration}"
+            if name == "sql":
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the time spent in the block to phase ``name``, if sampled"""
+    timing = _current.get()
+    if timing is None or name in timing.active:
+        # Not sampled, or already inside the same phase
+        yield
+        return
+    timing.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.active.discard(name)
+        timing.add(name, time.perf_counter() - started)
+
+
+class ServerTimingMixin:
+    """
+    Time the handler of a DRF view, from after the permission checks to
+    its response, as the "view" phase of sampled requests
+    """
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        timing = _current.get()
+        if timing is not None:
+            timing.view_started = time.perf_counter()
+
+    def finalize_response(
+        self, request: Request, response: Response, *args, **kwargs
+    ) -> Response:
+        timing = _current.get()
+        if timing is not None and timing.view_started is not None:
+            timing.add("view", time.perf_counter() - timing.view_started)
+            timing.view_started = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response) -> None:
+        self.sample_rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timing = RequestTiming()
+        token = _current.set(timing)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timing.execute)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        timing.finish()
+
+        response["Server-Timing"] = timing.header()
+        durations = timing.milliseconds()
+        logger.info(
+            "method=%s path=%s status=%s queries=%s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            timing.queries,
+            " ".join(
+                f"{name}_ms={duration}" for name, duration in durations.items()
+            ),
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": timing.queries,
+                "durations": durations,
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        """Called right before a DRF response is rendered"""
+        timing = _current.get()
+        if timing is not None:
+            timing.render_started = time.perf_counter()
+        return response
@@ -24,6 +24,7 @@ from drf_spectacular.views import (
 )
 
 from social_media_api import settings
+from social_media_api.metrics import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -39,6 +40,7 @@ urlpatterns = [
     path("api/social-media/comments/", include(
         "comments.urls", namespace="comments"
     )),
+    path("api/metrics/", metrics_view, name="metrics"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -0,0 +1,120 @@
+"""
+Streaming export of a user's own data.
+
+The archive is a gzip-compressed NDJSON file under
+PRIVATE_MEDIA_ROOT/exports, served to its owner only: one JSON object
+per line, tagged with its ``type``. Posts, commentaries
+and reactions are read with ``values().iterator(chunk_size=...)`` and
+written line by line, so memory use does not grow with the account. The
+file is written under a temporary name and renamed once complete.
+"""
+import gzip
+import os
+import uuid
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from comments.models import Commentary
+from likes.models import Reaction
+from posts.models import Post
+from social_media_api.storage import private_storage
+from users.models import DataExport
+
+EXPORT_DIR = "exports"
+
+
+def get_chunk_size() -> int:
+    return getattr(settings, "DATA_EXPORT_CHUNK_SIZE", 2000)
+
+
+def _records(kind: str, rows: Iterable[dict]) -> Iterator[dict]:
+    for row in rows:
+        yield {"type": kind, **row}
+
+
+def export_records(user) -> Iterator[dict]:
+    """Every record of ``user``'s export, in file order"""
+    chunk_size = get_chunk_size()
+    profile = getattr(user, "profile", None)
+    yield {
+        "type": "user",
+        "email": user.email,
+        "username": profile.username if profile else None,
+        "date_joined": user.date_joined,
+        "exported_at": timezone.now(),
+    }
+    yield from _records(
+        "post",
+        Post.objects.filter(owner=user)
+        .order_by("id")
+        .values("id", "title", "content", "created_time")
+        .iterator(chunk_size=chunk_size),
+    )
+    yield from _records(
+        "commentary",
+        Commentary.objects.filter(user=user)
+        .order_by("id")
+        .values("id", "post_id", "content", "created_time")
+        .iterator(chunk_size=chunk_size),
+    )
+    labels = {value: value.name.lower() for value in Reaction.Value}
+    for row in (
+        Reaction.objects.filter(user=user)
+        .order_by("id")
+        .values("post_id", "value")
+        .iterator(chunk_size=chunk_size)
+    ):
+        yield {
+            "type": "reaction",
+            "post_id": row["post_id"],
+            "value": labels[row["value"]],
+        }
+
+
+def write_export(export: DataExport) -> str:
+    """Write the archive of ``export`` and return its storage name"""
+    name = f"{EXPORT_DIR}/{export.user_id}-{uuid.uuid4().hex}.ndjson.gz"
+    path = private_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.part"
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    try:
+        with gzip.open(partial, "wt", encoding="utf-8") as archive:
+            for record in export_records(export.user):
+                archive.write(encoder.encode(record))
+                archive.write("\n")
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return name
+
+
+def run_export(export_id: int) -> Optional[DataExport]:
+    """
+    Build the archive of a pending export and record the outcome; None
+    if the export is no longer pending
+    """
+    claimed = DataExport.objects.filter(
+        pk=export_id, status=DataExport.Status.PENDING
+    ).update(status=DataExport.Status.RUNNING)
+    if not claimed:
+        return None
+    export = DataExport.objects.select_related("user__profile").get(
+        pk=export_id
+    )
+    try:
+        export.archive.name = write_export(export)
+    except Exception:
+        export.status = DataExport.Status.FAILED
+        export.finished_at = timezone.now()
+        export.save(update_fields=["status", "finished_at"])
+        raise
+    export.status = DataExport.Status.DONE
+    export.finished_at = timezone.now()
+    export.save(update_fields=["status", "archive", "finished_at"])
+    return export
@@ -1,5 +1,10 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from users.models import DataExport
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -39,5 +44,31 @@ class UserUsernameSerializer(serializers.ModelSerializer):
         field to the serialized output.
         """
         data = super().to_representation(instance)
-        data["username"] = instance.profile.username
+        profile = getattr(instance, "profile", None)
+        data["username"] = profile.username if profile else None
         return data
+
+
+class DataExportSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DataExport
+        fields = (
+            "id",
+            "status",
+            "created_at",
+            "finished_at",
+            "download_url",
+        )
+        read_only_fields = fields
+
+    def get_download_url(self, obj: DataExport) -> Optional[str]:
+        """Link to the archive once the export is done"""
+        if obj.status != DataExport.Status.DONE or not obj.archive:
+            return None
+        return reverse(
+            "users:export_download",
+            args=[obj.id],
+            request=self.context.get("request"),
+        )
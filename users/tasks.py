@@ -0,0 +1,28 @@
+from typing import Optional
+
+from celery import shared_task
+
+from users.exports import run_export
+from users.models import DataExport
+
+
+@shared_task
+def export_user_data(export_id: int) -> Optional[str]:
+    """
+    Task writing a user's data export archive.
+    """
+    export = run_export(export_id)
+    return export.archive.name if export else None
+
+
+@shared_task
+def run_pending_exports() -> int:
+    """
+    Beat task writing the exports requested while the broker was down.
+    """
+    export_ids = list(
+        DataExport.objects.filter(status=DataExport.Status.PENDING)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    return sum(run_export(export_id) is not None for export_id in export_ids)
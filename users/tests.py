@@ -1,3 +1,132 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from comments.models import Commentary
+from likes.models import Reaction
+from posts.models import Post
+from profiles.models import Profile
+from social_media_api import broker
+from users import tasks, views
+from users.models import DataExport
+
+EXPORT_URL = reverse("users:export_list")
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT, DATA_EXPORT_CHUNK_SIZE=2
+)
+class DataExportTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PRIVATE_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        patcher = mock.patch.object(broker, "monitor", available=False)
+        self.monitor = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test1@test.com",
+            "testpass",
+        )
+        Profile.objects.create(user=self.user, username="exporter")
+        self.other = get_user_model().objects.create_user(
+            "test2@test.com",
+            "testpass",
+        )
+        self.client.force_authenticate(self.user)
+        posts = [
+            Post.objects.create(title=f"title {index}", owner=self.user)
+            for index in range(5)
+        ]
+        foreign = Post.objects.create(title="foreign", owner=self.other)
+        Commentary.objects.create(post=foreign, user=self.user, content="hi")
+        Commentary.objects.create(post=posts[0], user=self.other, content="x")
+        Reaction.objects.create(
+            post=foreign, user=self.user, value=Reaction.Value.DISLIKE
+        )
+
+    def download(self, url: str) -> list[dict]:
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = gzip.decompress(b"".join(res.streaming_content))
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def test_export_streams_own_records(self):
+        res = self.client.post(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["status"], DataExport.Status.PENDING)
+        self.assertIsNone(res.data["download_url"])
+
+        self.assertEqual(tasks.run_pending_exports(), 1)
+
+        export = DataExport.objects.get()
+        path = os.path.join(PRIVATE_MEDIA_ROOT, export.archive.name)
+        self.assertTrue(os.path.isfile(path))
+        res = self.client.get(reverse("users:export_detail", args=[export.id]))
+        self.assertEqual(res.data["status"], DataExport.Status.DONE)
+        records = self.download(res.data["download_url"])
+        self.assertEqual(records[0]["type"], "user")
+        self.assertEqual(records[0]["username"], "exporter")
+        self.assertEqual(
+            [record["type"] for record in records[1:]],
+            ["post"] * 5 + ["commentary", "reaction"],
+        )
+        self.assertEqual(records[-2]["content"], "hi")
+        self.assertEqual(records[-1]["value"], "dislike")
+
+    def test_export_is_queued_when_broker_is_available(self):
+        self.monitor.available = True
+        with mock.patch.object(views.export_user_data, "delay") as delay:
+            res = self.client.post(EXPORT_URL)
+
+        export = DataExport.objects.get()
+        delay.assert_called_once_with(export.id)
+        self.assertEqual(res.data["status"], DataExport.Status.PENDING)
+        self.assertIsNone(res.data["download_url"])
+
+    def test_status_of_another_users_export_is_not_found(self):
+        export = DataExport.objects.create(user=self.other)
+
+        res = self.client.get(
+            reverse("users:export_detail", args=[export.id])
+        )
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(EXPORT_URL).data, [])
+
+    def test_archive_of_another_user_cannot_be_downloaded(self):
+        self.client.post(EXPORT_URL)
+        tasks.run_pending_exports()
+        url = reverse(
+            "users:export_download", args=[DataExport.objects.get().id]
+        )
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.client.force_authenticate(None)
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_export_runs_once(self):
+        export = DataExport.objects.create(user=self.user)
+
+        self.assertIsNotNone(tasks.export_user_data(export.id))
+        self.assertIsNone(tasks.export_user_data(export.id))
+        self.assertEqual(tasks.run_pending_exports(), 0)
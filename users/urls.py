@@ -5,13 +5,29 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from users.views import CreateUserView
+from users.views import (
+    CreateUserView,
+    DataExportDetailView,
+    DataExportDownloadView,
+    DataExportListView,
+)
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("exports/", DataExportListView.as_view(), name="export_list"),
+    path(
+        "exports/<int:pk>/",
+        DataExportDetailView.as_view(),
+        name="export_detail",
+    ),
+    path(
+        "exports/<int:pk>/download/",
+        DataExportDownloadView.as_view(),
+        name="export_download",
+    ),
 ]
 
 app_name = "users"
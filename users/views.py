@@ -1,5 +1,17 @@
-from rest_framework import generics
-from users.serializers import UserSerializer
+import os
+
+from django.db.models import QuerySet
+from django.http import FileResponse, Http404
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
+from rest_framework import generics, permissions
+
+from social_media_api.broker import is_broker_available, record_failure
+from users.models import DataExport
+from users.serializers import DataExportSerializer, UserSerializer
+from users.tasks import export_user_data
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -11,3 +23,63 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+
+class DataExportListView(generics.ListCreateAPIView):
+    """Request an export of your posts, commentaries and reactions"""
+
+    serializer_class = DataExportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[DataExport]:
+        return DataExport.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer: DataExportSerializer) -> None:
+        """
+        Create the export and let the worker write its archive.
+        If the broker is not available, or the message cannot be sent,
+        the export stays pending for the ``run_pending_exports`` task.
+        """
+        export = serializer.save(user=self.request.user)
+        if is_broker_available():
+            try:
+                export_user_data.delay(export.id)
+            except (OperationalError, RedisError):
+                record_failure()
+
+
+class DataExportDetailView(generics.RetrieveAPIView):
+    """Status of an export, with its download link once it is done"""
+
+    serializer_class = DataExportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[DataExport]:
+        return DataExport.objects.filter(user=self.request.user)
+
+
+class DataExportDownloadView(generics.RetrieveAPIView):
+    """Download the archive of a finished export"""
+
+    serializer_class = DataExportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[DataExport]:
+        return DataExport.objects.filter(
+            user=self.request.user, status=DataExport.Status.DONE
+        ).exclude(archive="")
+
+    @extend_schema(
+        responses={(200, "application/gzip"): OpenApiTypes.BINARY}
+    )
+    def retrieve(self, request, *args, **kwargs) -> FileResponse:
+        export = self.get_object()
+        try:
+            archive = export.archive.open("rb")
+        except FileNotFoundError as error:
+            raise Http404 from error
+        return FileResponse(
+            archive,
+            as_attachment=True,
+            filename=os.path.basename(export.archive.name),
+        )